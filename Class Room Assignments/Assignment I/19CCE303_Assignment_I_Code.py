@@ -1,8 +1,11 @@
-import librosa # Python package for music and audio analysis
 import matplotlib.pyplot as plt # Collection of command style functions that make matplotlib work like MATLAB
 import numpy as np # Support for large, multi-dimensional arrays and matrices
+from delta_modulation import delta_encode, delta_decode # Vectorised delta modulator and demodulator
+from pcm_quantizer import quantize_thresholds # Vectorised PCM quantiser
+from pcm_bitstream import code_width, pack_codes, unpack_codes # Packed bitstream for the PCM codes
+from audio_stream import load_audio # Streaming WAV loader with polyphase resampling
 
-y, sampling_rate = librosa.load('Impact_Moderato.wav', sr=41200, mono=False) # Load an audio file as a floating point time series
+y, sampling_rate = load_audio('Impact_Moderato.wav', sr=41200, mono=False) # Load an audio file as a floating point time series
 ts = 1/len(y[1]) # Choose sampling rate
 x = np.arange(0,1,ts) # Return evenly spaced values within a given interval
 print("\nTo perform quantization:\nMinimmum Value: " + str((min(y[1]))) + "\nMaximum Value: " + str((max(y[1]))))
@@ -13,21 +16,11 @@ plt.title("Sampled Version of Audio File")
 plt.xlabel("Time (t)"); plt.ylabel("Amplitude (A)")
 plt.grid(True); plt.show()
 
-encoding_delta = []
-delta = 0.01 # Initial Delta Value
-
-# Perform Delta Modulation: -
-for i in range(len(y[1])):
-    
-    if delta < y[1][i]:
-        encoding_delta.append(0)
-        delta = delta + 0.01
-    
-    else:
-        encoding_delta.append(1)
-        delta = delta - 0.01
+# Perform Delta Modulation (all channels, initial delta value 0.01, step 0.01): -
+encoding_delta_channels = delta_encode(y, step=0.01, initial=0.01)
+encoding_delta = encoding_delta_channels[1]
 print("\nLength of Encoded Data Array: ", len(encoding_delta))        
-print("First 50 Encoded Data: ", encoding_delta[0:50])
+print("First 50 Encoded Data: ", encoding_delta[0:50].tolist())
 
 start = -0.3
 quantization_levels = []
@@ -47,32 +40,16 @@ for i in range(len(quantization_levels)-1):
 print("\nNumber of Quantized Values: ", len(quantized_values))
 print("First 50 Quantized Values: ", quantized_values[0:50])
 
-encoding = encoded_signal = []
-for i in range(len(y[1])):    
-    flag = 0    
-    for j in range(len(quantized_values)):
-        
-        if y[1][i]<quantized_values[j]:
-            encoding.append(j+1)
-            encoded_signal.append(bin(j+1))
-            flag = 1
-        
-        if flag == 1:
-            break
-print("\nLength of Encoded Signal Array: ", len(encoded_signal))        
-print("First 50 Encoded Signal: ", encoded_signal[0:50])
-
-delta = 0.01 # Initial Delta Value
-reconstruction = reconstruction_delta = []
+# Code j+1 for the first quantized value above each sample; samples above the last one saturate at 128
+encoding = quantize_thresholds(y[1], quantized_values[:-1]) + 1
+bits_per_code = code_width(128)
+encoded_signal = pack_codes(encoding - 1, bits_per_code) # Codes 1..128 stored as 7-bit codewords 0..127
+print("\nLength of Encoded Signal Array: ", len(encoding))
+print("First 50 Encoded Signal: ", [bin(code) for code in (unpack_codes(encoded_signal, bits_per_code, 50) + 1).tolist()])
+print("Size of Encoded Bitstream: ", encoded_signal.nbytes, "bytes")
 
-# Perform Reconstruction for the Encoded Binary Numbers:
-for i in range(len(encoding_delta)):
-    if encoding_delta[i] == 0:
-        delta = delta + 0.001
-        reconstruction_delta.append(delta)
-    else:
-        delta = delta - 0.001
-        reconstruction_delta.append(delta)
+# Perform Reconstruction for the Encoded Binary Numbers (initial delta value 0.01, step 0.001):
+reconstruction = reconstruction_delta = delta_decode(encoding_delta, step=0.001, initial=0.01)
 
 plt.plot(x, reconstruction_delta)
 plt.title("Reconstructed Audio File from the Encoded Binary Numbers")
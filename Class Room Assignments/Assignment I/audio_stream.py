@@ -0,0 +1,153 @@
+"""Streaming WAV loader with polyphase resampling, replacing librosa.load in 19CCE303_Assignment_I_Code.py.
+
+Audio is read block by block through soundfile when it is installed, or the
+standard library wave module (integer PCM only) otherwise, and each block is
+resampled as it arrives by StreamingResampler. The resampler keeps the tail
+of the previous block, so the output matches scipy.signal.resample_poly on the
+whole file (same Kaiser-windowed anti-aliasing filter) without ever holding
+more than one block of input. Only NumPy is imported.
+"""
+import math
+import wave
+
+import numpy as np
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+BLOCK_SIZE = 65536 # Input frames read per block
+HALF_LENGTH = 10 # Filter half-length in units of the larger of up and down (as in resample_poly)
+KAISER_BETA = 5.0 # Kaiser window shape of the anti-aliasing filter
+
+def resampling_filter(up, down):
+    """Returns the anti-aliasing FIR of a polyphase resampler by up/down, scaled by up"""
+    max_rate = max(up, down)
+    half_length = HALF_LENGTH * max_rate
+    n = np.arange(2 * half_length + 1) - half_length
+    h = np.sinc(n / max_rate) * np.kaiser(2 * half_length + 1, KAISER_BETA)
+    return h * (up / h.sum()) # Unit DC gain after zero stuffing
+
+class StreamingResampler:
+    """Polyphase resampler by up/down that carries its input history between blocks"""
+    def __init__(self, up, down, channels=1):
+        divisor = math.gcd(up, down)
+        self.up = up // divisor
+        self.down = down // divisor
+        h = resampling_filter(self.up, self.down)
+        self.delay = (len(h) - 1) // 2 # Centre of the filter, in upsampled samples
+        self.taps = -(-len(h) // self.up) # Input samples under the filter
+        # Phase p holds h[p], h[p+up], ... so output y uses phase (t % up) against x[t//up], x[t//up - 1], ...
+        polyphase = np.zeros(self.up * self.taps)
+        polyphase[:len(h)] = h
+        self.polyphase = polyphase.reshape(self.taps, self.up).T
+        self.channels = channels
+        self.history = np.zeros((channels, self.taps - 1))
+        self.consumed = 0 # Input frames seen so far
+        self.produced = 0 # Output frames emitted so far
+
+    def _emit(self, block, last):
+        """Returns every output sample whose newest input frame is before last"""
+        # Output n is centred on upsampled index n*down, so its newest input is (n*down + delay) // up
+        stop = -(-(last * self.up - self.delay) // self.down) # First output needing input frame last
+        outputs = np.arange(self.produced, max(stop, self.produced))
+        self.produced += len(outputs)
+        window = np.concatenate([self.history, block], axis=1)
+        start = self.consumed - self.history.shape[1] # Input frame held in window[:, 0]
+        self.consumed += block.shape[1]
+        self.history = window[:, window.shape[1] - (self.taps - 1):]
+        if len(outputs) == 0:
+            return np.zeros((self.channels, 0))
+        result = np.empty((self.channels, len(outputs)))
+        for first in range(0, len(outputs), BLOCK_SIZE): # Bounds the gathered windows when upsampling
+            upsampled = outputs[first:first + BLOCK_SIZE] * self.down + self.delay
+            newest = upsampled // self.up - start
+            coefficients = self.polyphase[upsampled % self.up] # (outputs, taps)
+            frames = window[:, newest[:, None] - np.arange(self.taps)] # (channels, outputs, taps)
+            result[:, first:first + len(upsampled)] = np.einsum('cot,ot->co', frames, coefficients)
+        return result
+
+    def process(self, block):
+        """Resamples the next (channels, frames) block"""
+        block = np.atleast_2d(np.asarray(block, dtype=np.float64))
+        return self._emit(block, self.consumed + block.shape[1])
+
+    def flush(self, total_frames=None):
+        """Returns the remaining output, assuming silence after the last block, up to
+        ceil(total_frames * up / down) samples in all (total_frames defaults to the frames seen)"""
+        total_frames = self.consumed if total_frames is None else total_frames
+        length = -(-total_frames * self.up // self.down)
+        padding = -(-((length - 1) * self.down + self.delay) // self.up) + 1 - self.consumed
+        tail = self._emit(np.zeros((self.channels, max(padding, 0))), self.consumed + max(padding, 0))
+        return tail[:, :max(length - (self.produced - tail.shape[1]), 0)]
+
+def audio_info(path):
+    """Returns the sampling rate, number of channels and number of frames of an audio file"""
+    if SOUNDFILE_AVAILABLE:
+        info = soundfile.info(path)
+        return info.samplerate, info.channels, info.frames
+    with wave.open(path, 'rb') as file:
+        return file.getframerate(), file.getnchannels(), file.getnframes()
+
+def _pcm_to_float(data, sample_width, channels):
+    """Converts interleaved little-endian PCM bytes to a (channels, frames) array in [-1, 1)"""
+    if sample_width == 1:
+        samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif sample_width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        samples = (raw[:, 0].astype(np.int32) | raw[:, 1].astype(np.int32) << 8
+                   | raw[:, 2].astype(np.int8).astype(np.int32) << 16) / float(1 << 23)
+    elif sample_width in (2, 4):
+        dtype = np.dtype('<i%d' % sample_width)
+        samples = np.frombuffer(data, dtype=dtype) / float(1 << (8 * sample_width - 1))
+    else:
+        raise ValueError('Unsupported sample width of %d bytes' % sample_width)
+    return samples.astype(np.float32).reshape(-1, channels).T
+
+def read_blocks(path, block_size=BLOCK_SIZE):
+    """Yields (channels, frames) float32 blocks of an audio file"""
+    if SOUNDFILE_AVAILABLE:
+        with soundfile.SoundFile(path) as file:
+            while True:
+                block = file.read(block_size, dtype='float32', always_2d=True)
+                if len(block) == 0:
+                    return
+                yield block.T
+    with wave.open(path, 'rb') as file:
+        channels, sample_width = file.getnchannels(), file.getsampwidth()
+        while True:
+            data = file.readframes(block_size)
+            if not data:
+                return
+            yield _pcm_to_float(data, sample_width, channels)
+
+def stream_audio(path, sr=None, mono=True, block_size=BLOCK_SIZE):
+    """Yields float32 blocks of an audio file resampled to sr, (frames,) if mono else (channels, frames)"""
+    sampling_rate, channels, frames = audio_info(path)
+    channels = 1 if mono else channels
+    resampler = StreamingResampler(sr, sampling_rate, channels) if sr and sr != sampling_rate else None
+    for block in read_blocks(path, block_size):
+        if mono:
+            block = block.mean(axis=0, keepdims=True)
+        if resampler:
+            block = resampler.process(block)
+        yield block[0].astype(np.float32) if mono else block.astype(np.float32)
+    if resampler:
+        tail = resampler.flush(frames)
+        yield tail[0].astype(np.float32) if mono else tail.astype(np.float32)
+
+def load_audio(path, sr=None, mono=True, block_size=BLOCK_SIZE):
+    """Loads an audio file like librosa.load, returning (y, sr) with y float32 of shape
+    (frames,) if mono else (channels, frames), even for single-channel files"""
+    sampling_rate, channels, frames = audio_info(path)
+    sr = sr or sampling_rate
+    length = -(-frames * sr // sampling_rate) if sr != sampling_rate else frames
+    y = np.empty((length,) if mono else (channels, length), dtype=np.float32)
+    position = 0
+    for block in stream_audio(path, sr, mono, block_size):
+        count = block.shape[-1]
+        y[..., position:position + count] = block
+        position += count
+    return y[..., :position], sr
@@ -0,0 +1,99 @@
+"""Bitrate versus SNR benchmark of the fixed-step and adaptive delta modulators of delta_modulation.py.
+
+Each WAV file is normalised to [-1, 1], upsampled by every oversampling
+factor (delta modulation sends one bit per sample, so the bitrate is the
+upsampled rate), encoded, decoded and resampled back to the original rate,
+where the SNR against the input is measured. Adaptive modes are run in
+--chunk-size blocks to exercise their streaming state. Results are written
+as JSON.
+
+    python benchmark_delta_modulation.py --oversampling 1 2 4 8 --output delta_results.json
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from scipy.io import wavfile
+from scipy.signal import resample_poly
+
+from delta_modulation import ADAPTIVE_MODES, DELTA, AdaptiveDeltaModulator, delta_decode, delta_encode
+
+SPEECH_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Assignment IV')
+DEFAULT_FILES = [os.path.join(SPEECH_DIRECTORY, name) for name in ('clean_speech.wav', 'noisy_speech.wav')]
+MODES = ('fixed',) + ADAPTIVE_MODES
+
+def load_wav(path):
+    """Returns the sampling rate and the first channel of a WAV file scaled to [-1, 1]"""
+    sampling_rate, data = wavfile.read(path)
+    if data.ndim > 1:
+        data = data[:, 0]
+    if np.issubdtype(data.dtype, np.integer):
+        data = data / float(np.iinfo(data.dtype).max + 1)
+    return sampling_rate, data.astype(np.float64)
+
+def snr_db(reference, estimate):
+    """Returns the signal-to-noise ratio of an estimate in decibels"""
+    return 10 * np.log10(np.sum(reference**2) / np.sum((reference - estimate)**2))
+
+def modulate(signal, mode, step, chunk_size):
+    """Encodes and decodes a signal with one delta modulator, returning the reconstruction"""
+    if mode == 'fixed':
+        return delta_decode(delta_encode(signal, step=step, initial=0.0), step=step, initial=0.0)
+    encoder = AdaptiveDeltaModulator(mode)
+    decoder = AdaptiveDeltaModulator(mode)
+    chunks = [decoder.decode(encoder.encode(signal[start:start + chunk_size]))
+              for start in range(0, len(signal), chunk_size)]
+    return np.concatenate(chunks)
+
+def benchmark_file(path, oversampling, modes, step, chunk_size):
+    """Returns the bitrate, SNR and throughput records of every mode and oversampling factor for one file"""
+    sampling_rate, signal = load_wav(path)
+    results = []
+    for factor in oversampling:
+        upsampled = resample_poly(signal, factor, 1) if factor > 1 else signal
+        for mode in modes:
+            modulate(upsampled[:chunk_size], mode, step, chunk_size) # Compile outside the timing
+            start = time.perf_counter()
+            reconstruction = modulate(upsampled, mode, step, chunk_size)
+            elapsed = time.perf_counter() - start
+            if factor > 1:
+                reconstruction = resample_poly(reconstruction, 1, factor)[:len(signal)]
+            results.append({
+                'file': os.path.basename(path),
+                'mode': mode,
+                'oversampling': factor,
+                'bitrate': sampling_rate * factor,
+                'snr_db': float(snr_db(signal, reconstruction)),
+                'samples_per_second': len(upsampled) / elapsed,
+            })
+    return results
+
+def parse_arguments():
+    """Parses the command line options"""
+    parser = argparse.ArgumentParser(description='Compare fixed-step and adaptive delta modulation')
+    parser.add_argument('files', nargs='*', default=DEFAULT_FILES)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--oversampling', nargs='+', type=int, default=[1, 2, 4, 8])
+    parser.add_argument('--step', type=float, default=DELTA, help='step size of the fixed-step modulator')
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--output', default='delta_results.json')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    results = []
+    for path in args.files:
+        records = benchmark_file(path, args.oversampling, args.modes, args.step, args.chunk_size)
+        for record in records:
+            print('%-18s %-7s %7.1f kbit/s  SNR %6.2f dB  %8.1f Msamples/s'
+                  % (record['file'], record['mode'], record['bitrate'] / 1000, record['snr_db'],
+                     record['samples_per_second'] / 1e6))
+        results.extend(records)
+    with open(args.output, 'w') as file:
+        json.dump({'numpy': np.__version__, 'results': results}, file, indent=2)
+    print('Results written to', args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Delta modulation encoder and decoder used by 19CCE303_Assignment_I_Code.py.
+
+Bits follow the assignment's convention: 0 means the staircase steps up and
+1 means it steps down. Signals may be (samples,) or (channels, samples), e.g.
+all channels of librosa.load(..., mono=False). Decoding is a vectorised
+cumulative sum; encoding is inherently sequential and runs in a Numba kernel
+when Numba is installed, otherwise in the same loop in plain Python.
+
+AdaptiveDeltaModulator adds Jayant and CVSD step adaptation. It keeps each
+channel's level, step and last three bits between calls, so a signal can be
+encoded or decoded chunk by chunk with the same result as in one call. Use one
+instance per side of the link.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+DELTA = 0.01 # Step size
+INITIAL_LEVEL = 0.01 # Initial staircase value
+MIN_STEP = 0.0005 # Smallest adaptive step size
+MAX_STEP = 0.1 # Largest adaptive step size
+JAYANT_MULTIPLIER = 1.5 # Step growth on repeated bits (and shrink on alternating bits)
+CVSD_DECAY = 0.99 # Syllabic decay of the CVSD step per sample
+CVSD_INCREMENT = 0.002 # Step added when the last three bits agree
+ADAPTIVE_MODES = ('jayant', 'cvsd')
+
+def jit(function):
+    """Compiles a kernel with Numba when it is installed"""
+    if NUMBA_AVAILABLE:
+        return njit(cache=True, nogil=True)(function)
+    return function
+
+@jit
+def _encode_kernel(signal, step, levels, bits):
+    """Tracks each channel with a staircase, writing one bit per sample and leaving the final levels"""
+    for channel in range(signal.shape[0]):
+        level = levels[channel]
+        for i in range(signal.shape[1]):
+            if level < signal[channel, i]:
+                bits[channel, i] = 0
+                level = level + step
+            else:
+                bits[channel, i] = 1
+                level = level - step
+        levels[channel] = level
+
+def delta_encode(signal, step=DELTA, initial=INITIAL_LEVEL):
+    """Returns the delta modulation bits (uint8, same shape as signal) of a signal"""
+    signal = np.asarray(signal)
+    channels = np.atleast_2d(signal)
+    bits = np.empty(channels.shape, dtype=np.uint8)
+    levels = np.broadcast_to(np.asarray(initial, dtype=np.float64), channels.shape[:1]).copy()
+    _encode_kernel(np.ascontiguousarray(channels), float(step), levels, bits)
+    return bits.reshape(signal.shape)
+
+def delta_decode(bits, step=DELTA, initial=INITIAL_LEVEL):
+    """Reconstructs the staircase signal from delta modulation bits"""
+    bits = np.asarray(bits)
+    steps = np.cumsum(1 - 2 * bits.astype(np.int64), axis=-1)
+    return np.asarray(initial, dtype=np.float64)[..., None] + step * steps # Per-channel initial levels broadcast
+
+@jit
+def _adaptive_kernel(signal, bits, levels, steps, history, output, encode, cvsd,
+                     multiplier, decay, increment, min_step, max_step):
+    """Runs the adaptive staircase over each channel, encoding signal into bits or decoding bits,
+    writing the staircase to output and leaving the final levels, steps and bit histories"""
+    for channel in range(bits.shape[0]):
+        level = levels[channel]
+        step = steps[channel]
+        register = history[channel]
+        for i in range(bits.shape[1]):
+            if encode:
+                bit = 0 if level < signal[channel, i] else 1
+                bits[channel, i] = bit
+            else:
+                bit = int(bits[channel, i])
+            register = ((register << 1) | bit) & 7 # Last three bits
+            if cvsd:
+                step = step * decay
+                if register == 0 or register == 7:
+                    step = step + increment
+            elif (register & 1) == ((register >> 1) & 1):
+                step = step * multiplier
+            else:
+                step = step / multiplier
+            step = min(max(step, min_step), max_step)
+            if bit == 0:
+                level = level + step
+            else:
+                level = level - step
+            output[channel, i] = level
+        levels[channel] = level
+        steps[channel] = step
+        history[channel] = register
+
+class AdaptiveDeltaModulator:
+    """Adaptive delta modulator or demodulator keeping its per-channel state between chunks"""
+    def __init__(self, mode='cvsd', channels=1, initial=0.0, min_step=MIN_STEP, max_step=MAX_STEP,
+                 multiplier=JAYANT_MULTIPLIER, decay=CVSD_DECAY, increment=CVSD_INCREMENT):
+        if mode not in ADAPTIVE_MODES:
+            raise ValueError('Unknown adaptive mode %r, expected one of %s' % (mode, ADAPTIVE_MODES))
+        self.mode = mode
+        self.channels = channels
+        self.initial = initial
+        self.min_step = min_step
+        self.max_step = max_step
+        self.multiplier = multiplier
+        self.decay = decay
+        self.increment = increment
+        self.reset()
+
+    def reset(self):
+        """Returns every channel to its initial level and smallest step"""
+        self.levels = np.full(self.channels, self.initial, dtype=np.float64)
+        self.steps = np.full(self.channels, self.min_step, dtype=np.float64)
+        self.history = np.full(self.channels, 0b010, dtype=np.int64) # No run of equal bits yet
+
+    def _run(self, signal, bits, encode):
+        output = np.empty(bits.shape, dtype=np.float64)
+        if bits.shape[0] != self.channels:
+            raise ValueError('Expected %d channels, got %d' % (self.channels, bits.shape[0]))
+        _adaptive_kernel(signal, bits, self.levels, self.steps, self.history, output, encode,
+                         self.mode == 'cvsd', float(self.multiplier), float(self.decay),
+                         float(self.increment), float(self.min_step), float(self.max_step))
+        return output
+
+    def encode(self, chunk):
+        """Returns the bits (uint8, same shape as chunk) of the next chunk of the signal"""
+        chunk = np.asarray(chunk)
+        channels = np.ascontiguousarray(np.atleast_2d(chunk), dtype=np.float64)
+        bits = np.empty(channels.shape, dtype=np.uint8)
+        self._run(channels, bits, True)
+        return bits.reshape(chunk.shape)
+
+    def decode(self, bits):
+        """Returns the reconstructed staircase of the next chunk of bits"""
+        bits = np.asarray(bits)
+        channels = np.ascontiguousarray(np.atleast_2d(bits), dtype=np.uint8)
+        return self._run(np.empty((1, 1)), channels, False).reshape(bits.shape)
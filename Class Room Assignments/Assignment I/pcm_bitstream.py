@@ -0,0 +1,60 @@
+"""Packed bitstream storage for the PCM codes of 19CCE303_Assignment_I_Code.py.
+
+Each code is written MSB first as a fixed-width codeword and the codewords are
+concatenated into a contiguous np.packbits byte buffer, so 128-level PCM costs
+7 bits per sample instead of a bin() string. A bitstream file is a 16-byte
+header (magic, codeword width, code count) followed by the packed buffer.
+"""
+import struct
+
+import numpy as np
+
+MAGIC = b'PCMB'
+HEADER = struct.Struct('<4sB3xQ') # Magic, bits per code, padding, number of codes
+
+def code_width(num_levels):
+    """Returns the number of bits needed for codes 0..num_levels-1"""
+    return max(int(num_levels - 1).bit_length(), 1)
+
+def pack_codes(codes, bits_per_code):
+    """Packs integer codes into a byte buffer of fixed-width MSB-first codewords"""
+    codes = np.asarray(codes).ravel()
+    if not 1 <= bits_per_code <= 64:
+        raise ValueError('bits_per_code must be between 1 and 64, got %d' % bits_per_code)
+    if len(codes) and (codes.min() < 0 or int(codes.max()) >> bits_per_code):
+        raise ValueError('Codes do not fit in %d bits' % bits_per_code)
+    if bits_per_code == 8:
+        return codes.astype(np.uint8) # Already one codeword per byte
+    shifts = np.arange(bits_per_code - 1, -1, -1, dtype=np.uint64)
+    bits = (codes.astype(np.uint64)[:, None] >> shifts) & np.uint64(1)
+    return np.packbits(bits.astype(np.uint8))
+
+def unpack_codes(buffer, bits_per_code, count):
+    """Recovers count codes from a buffer written by pack_codes"""
+    buffer = np.frombuffer(buffer, dtype=np.uint8) if isinstance(buffer, bytes) else np.asarray(buffer, np.uint8)
+    if len(buffer) * 8 < count * bits_per_code:
+        raise ValueError('Buffer holds fewer than %d codes of %d bits' % (count, bits_per_code))
+    if bits_per_code == 8:
+        return buffer[:count].copy()
+    bits = np.unpackbits(buffer, count=count * bits_per_code).reshape(count, bits_per_code)
+    weights = np.left_shift(np.uint64(1), np.arange(bits_per_code - 1, -1, -1, dtype=np.uint64))
+    codes = bits.astype(np.uint64) @ weights
+    return codes.astype(np.min_scalar_type((1 << bits_per_code) - 1))
+
+def write_bitstream(path, codes, bits_per_code):
+    """Writes codes to a bitstream file and returns the number of bytes written"""
+    codes = np.asarray(codes).ravel()
+    packed = pack_codes(codes, bits_per_code)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, bits_per_code, len(codes)))
+        file.write(packed.tobytes())
+    return HEADER.size + packed.nbytes
+
+def read_bitstream(path):
+    """Reads a bitstream file, returning its codes and codeword width"""
+    with open(path, 'rb') as file:
+        magic, bits_per_code, count = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError('%s is not a PCM bitstream file' % path)
+        buffer = file.read()
+    return unpack_codes(buffer, bits_per_code, count), bits_per_code
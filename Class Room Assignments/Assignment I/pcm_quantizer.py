@@ -0,0 +1,84 @@
+"""Vectorised PCM quantiser used by 19CCE303_Assignment_I_Code.py.
+
+A quantiser is described by its sorted decision thresholds: a sample gets the
+index of the first threshold it lies below, so codes run from 0 to
+len(thresholds) and a whole array is encoded with a single np.searchsorted.
+Uniform quantisers skip the search and compute the index arithmetically, with
+optional mu-law or A-law companding applied before quantisation and undone
+after reconstruction. Codes come back in the smallest unsigned integer type
+that holds them, e.g. uint8 for up to 256 levels.
+"""
+import numpy as np
+
+NUM_LEVELS = 128 # Number of quantization levels
+MU = 255.0 # mu-law compression parameter (North America, Japan)
+A = 87.6 # A-law compression parameter (Europe)
+COMPANDING_LAWS = ('uniform', 'mu', 'a')
+
+def code_dtype(num_levels):
+    """Returns the smallest unsigned integer type holding codes 0..num_levels-1"""
+    return np.min_scalar_type(max(num_levels - 1, 0))
+
+def mu_law_compress(signal, mu=MU, peak=1.0):
+    """Applies mu-law compression to a signal in [-peak, peak]"""
+    x = np.asarray(signal, dtype=np.float64) / peak
+    return peak * np.sign(x) * np.log1p(mu * np.abs(x)) / np.log1p(mu)
+
+def mu_law_expand(signal, mu=MU, peak=1.0):
+    """Inverts mu_law_compress"""
+    y = np.asarray(signal, dtype=np.float64) / peak
+    return peak * np.sign(y) * np.expm1(np.abs(y) * np.log1p(mu)) / mu
+
+def a_law_compress(signal, a=A, peak=1.0):
+    """Applies A-law compression to a signal in [-peak, peak]"""
+    x = np.asarray(signal, dtype=np.float64) / peak
+    ax = a * np.abs(x)
+    y = np.where(ax < 1, ax, 1 + np.log(np.maximum(ax, 1))) / (1 + np.log(a))
+    return peak * np.sign(x) * y
+
+def a_law_expand(signal, a=A, peak=1.0):
+    """Inverts a_law_compress"""
+    y = np.asarray(signal, dtype=np.float64) / peak
+    scaled = np.abs(y) * (1 + np.log(a))
+    x = np.where(scaled < 1, scaled, np.exp(np.minimum(scaled, 1 + np.log(a)) - 1)) / a
+    return peak * np.sign(y) * x
+
+def compand(signal, law='uniform', peak=1.0):
+    """Compresses a signal with the given companding law ('uniform' leaves it unchanged)"""
+    if law == 'mu':
+        return mu_law_compress(signal, peak=peak)
+    if law == 'a':
+        return a_law_compress(signal, peak=peak)
+    if law == 'uniform':
+        return np.asarray(signal, dtype=np.float64)
+    raise ValueError('Unknown companding law %r, expected one of %s' % (law, COMPANDING_LAWS))
+
+def expand(signal, law='uniform', peak=1.0):
+    """Inverts compand"""
+    if law == 'mu':
+        return mu_law_expand(signal, peak=peak)
+    if law == 'a':
+        return a_law_expand(signal, peak=peak)
+    if law == 'uniform':
+        return np.asarray(signal, dtype=np.float64)
+    raise ValueError('Unknown companding law %r, expected one of %s' % (law, COMPANDING_LAWS))
+
+def quantize_thresholds(signal, thresholds):
+    """Returns the index of the first threshold above each sample (len(thresholds) when none is)"""
+    thresholds = np.asarray(thresholds)
+    codes = np.searchsorted(thresholds, signal, side='right')
+    return codes.astype(code_dtype(len(thresholds) + 1))
+
+def quantize(signal, num_levels=NUM_LEVELS, low=-1.0, high=1.0, law='uniform'):
+    """Returns the codes of a uniform num_levels quantiser over [low, high], after companding"""
+    step = (high - low) / num_levels
+    companded = compand(signal, law, peak=max(abs(low), abs(high)))
+    codes = np.floor((companded - low) / step)
+    np.clip(codes, 0, num_levels - 1, out=codes) # Out-of-range samples saturate at the end levels
+    return codes.astype(code_dtype(num_levels))
+
+def dequantize(codes, num_levels=NUM_LEVELS, low=-1.0, high=1.0, law='uniform'):
+    """Reconstructs each code as the midpoint of its level, then undoes the companding"""
+    step = (high - low) / num_levels
+    midpoints = low + (np.asarray(codes, dtype=np.float64) + 0.5) * step
+    return expand(midpoints, law, peak=max(abs(low), abs(high)))
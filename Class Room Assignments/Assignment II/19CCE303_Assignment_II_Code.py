@@ -1,26 +1,20 @@
+from duobinary import precode, map_levels, duobinary_encode, duobinary_decode # Vectorised duobinary coding
+
 binary_data = [1,0,0,1,0,1,1,1,0,1,1,0]
 print("\nBinary Data Sequence, {dk}: ", binary_data)
 
 # Precodes it for a duobinary pulse transmission system to produce the sequence, {pk}: -
-pn =[]; pn.append(0); m = 2
-for i in range(len(binary_data)):
-    pn.append((binary_data[i] - pn[i]) % m)
-print("Precoded and Produced Sequence, {pk}: ", pn)
+pn = precode(binary_data)
+print("Precoded and Produced Sequence, {pk}: ", pn.tolist())
 
 # Maps the precoded sequence into the transmitted amplitude levels, {ak}: -
-an = []
-for i in range(0,len(pn)):
-    an.append(2*pn[i] - (m-1))
-print("Transmitted Amplitude Levels, {ak}: ", an)
+an = map_levels(pn)
+print("Transmitted Amplitude Levels, {ak}: ", an.tolist())
 
 # Received noise-free sequences, {bk}: -
-bn = []
-for i in range(1,len(pn)):
-    bn.append(an[i] + an[i-1])
-print("Received Noise-Free Sequences, {bk}: ", bn)
+bn = duobinary_encode(an)
+print("Received Noise-Free Sequences, {bk}: ", bn.tolist())
 
 # Recover the original data sequence: -
-dn = []
-for i in range(len(bn)):
-    dn.append(int((((bn[i]/2) + (m-1)) % m)))
-print("Recovered Original Data Sequence: ", dn)
+dn = duobinary_decode(bn)
+print("Recovered Original Data Sequence: ", dn.tolist())
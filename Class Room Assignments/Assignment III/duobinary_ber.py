@@ -0,0 +1,160 @@
+"""Monte-Carlo bit error rate engine for the precoded duobinary link of 19CCE303_Assignment_III_Code.py.
+
+Noise is added to the transmitted levels {ak} before the 1 + D receiver, as
+in the assignment. All noise points are simulated together as one (points,
+frames, bits) batch of independent FRAME_BITS-bit frames, which the Viterbi
+detector runs in parallel; after every batch the points that have seen target_errors
+errors (or max_bits bits) drop out and the rest get another batch. BERs are
+returned with Clopper-Pearson confidence intervals, which stay meaningful
+when no errors are seen. The detector is either the symbol-by-symbol
+|b| < 1 threshold or the Viterbi sequence detector of duobinary_viterbi.py.
+
+Each point draws from its own random_streams stream keyed by its index, so
+results are reproducible from the seed and do not change when the points are
+split across --workers processes.
+
+    python duobinary_ber.py --ebn0 0 2 4 6 8 --target-errors 200 --detector viterbi
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.special import erfc
+from scipy.stats import beta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Assignment II'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+from duobinary import precode, map_levels, duobinary_encode, duobinary_decode
+from duobinary_viterbi import viterbi_decode
+from random_streams import root_seed, spawn_seeds
+
+TARGET_ERRORS = 100 # Errors to observe at each point before it stops
+BATCH_BITS = 100000 # Bits simulated per point in each batch
+FRAME_BITS = 1000 # Bits per independently precoded frame
+MAX_BITS = 10**7 # Bits after which a point stops regardless of its error count
+CONFIDENCE = 0.95
+DETECTORS = ('symbol', 'viterbi')
+
+def ebn0_to_sigma(ebn0_db):
+    """Returns the noise standard deviation on the +/-1 levels for an Eb/N0 in dB (Eb = 1, N0 = 2 sigma^2)"""
+    return np.sqrt(0.5 / 10**(np.asarray(ebn0_db, dtype=np.float64) / 10))
+
+def sigma_to_ebn0(sigma):
+    """Inverts ebn0_to_sigma"""
+    return 10 * np.log10(0.5 / np.asarray(sigma, dtype=np.float64)**2)
+
+def q_function(x):
+    """Gaussian tail probability"""
+    return 0.5 * erfc(x / np.sqrt(2))
+
+def theoretical_ber(sigma):
+    """Returns the BER of the |b| < 1 detector when each received sample carries noise of variance 2 sigma^2"""
+    scale = np.sqrt(2) * np.asarray(sigma, dtype=np.float64)
+    # d = 1 sends b = 0 (error if |noise| > 1); d = 0 sends b = +/-2 (error if the noise lands in (-3, -1))
+    return 1.5 * q_function(1 / scale) - 0.5 * q_function(3 / scale)
+
+def confidence_interval(errors, bits, confidence=CONFIDENCE):
+    """Returns the Clopper-Pearson (lower, upper) bounds of the BER for error and bit counts"""
+    errors = np.asarray(errors, dtype=np.float64)
+    bits = np.asarray(bits, dtype=np.float64)
+    alpha = 1 - confidence
+    lower = np.where(errors > 0, beta.ppf(alpha / 2, errors, bits - errors + 1), 0.0)
+    upper = np.where(errors < bits, beta.ppf(1 - alpha / 2, errors + 1, bits - errors), 1.0)
+    return lower, upper
+
+def count_errors(sigma, num_frames, rngs, detector='symbol'):
+    """Sends num_frames random frames through the link at every noise level, each drawing
+    from its own generator in rngs, and returns the error counts"""
+    data = np.empty((len(sigma), num_frames, FRAME_BITS), dtype=np.uint8)
+    noise = np.empty((len(sigma), num_frames, FRAME_BITS + 1))
+    for k, rng in enumerate(rngs):
+        data[k] = rng.integers(0, 2, data.shape[1:], dtype=np.uint8)
+        noise[k] = rng.normal(0, sigma[k], noise.shape[1:])
+    levels = map_levels(precode(data))
+    received = duobinary_encode(levels + noise)
+    if detector == 'viterbi':
+        decoded = viterbi_decode(received.reshape(-1, FRAME_BITS)).reshape(data.shape)
+    else:
+        decoded = duobinary_decode(received)
+    return np.count_nonzero(decoded != data, axis=(1, 2))
+
+def count_point_errors(sigma, seeds, target_errors, batch_bits, max_bits, detector):
+    """Runs batches at the given noise levels, each from its own seed, until every point has seen
+    target_errors errors or max_bits bits, returning the error and bit counts"""
+    rngs = [np.random.default_rng(seed) for seed in seeds]
+    errors = np.zeros(len(sigma), dtype=np.int64)
+    bits = np.zeros(len(sigma), dtype=np.int64)
+    active = np.ones(len(sigma), dtype=bool)
+    while active.any():
+        num_frames = -(-int(min(batch_bits, max_bits - bits[active].min())) // FRAME_BITS)
+        errors[active] += count_errors(sigma[active], num_frames, [rngs[k] for k in np.nonzero(active)[0]], detector)
+        bits[active] += num_frames * FRAME_BITS
+        active = (errors < target_errors) & (bits < max_bits)
+    return errors, bits
+
+def simulate_ber(sigma=None, ebn0_db=None, target_errors=TARGET_ERRORS, batch_bits=BATCH_BITS,
+                 max_bits=MAX_BITS, confidence=CONFIDENCE, seed=None, detector='symbol', workers=1):
+    """Estimates the BER at each noise level (or Eb/N0 in dB), returning a dict of per-point arrays"""
+    if (sigma is None) == (ebn0_db is None):
+        raise ValueError('Pass exactly one of sigma and ebn0_db')
+    if detector not in DETECTORS:
+        raise ValueError('Unknown detector %r, expected one of %s' % (detector, DETECTORS))
+    sigma = np.atleast_1d(np.asarray(sigma, dtype=np.float64) if sigma is not None else ebn0_to_sigma(ebn0_db))
+    seeds = spawn_seeds(len(sigma), seed) # One stream per point, so splitting the points does not change the draws
+    if workers > 1 and len(sigma) > 1:
+        groups = [group for group in np.array_split(np.arange(len(sigma)), workers) if len(group)]
+        with ProcessPoolExecutor(len(groups)) as executor:
+            futures = [executor.submit(count_point_errors, sigma[group], [seeds[k] for k in group],
+                                       target_errors, batch_bits, max_bits, detector) for group in groups]
+            counts = [future.result() for future in futures]
+        errors = np.concatenate([count[0] for count in counts])
+        bits = np.concatenate([count[1] for count in counts])
+    else:
+        errors, bits = count_point_errors(sigma, seeds, target_errors, batch_bits, max_bits, detector)
+    lower, upper = confidence_interval(errors, bits, confidence)
+    return {
+        'sigma': sigma,
+        'ebn0_db': sigma_to_ebn0(sigma),
+        'ber': errors / bits,
+        'lower': lower,
+        'upper': upper,
+        'errors': errors,
+        'bits': bits,
+        'theoretical_ber': theoretical_ber(sigma),
+    }
+
+def print_results(results):
+    """Prints one line per noise point"""
+    for k in range(len(results['sigma'])):
+        print('sigma %-7.4g Eb/N0 %6.2f dB  BER %.3e  [%.3e, %.3e]  %7d errors in %9d bits  (threshold theory %.3e)'
+              % (results['sigma'][k], results['ebn0_db'][k], results['ber'][k], results['lower'][k],
+                 results['upper'][k], results['errors'][k], results['bits'][k], results['theoretical_ber'][k]))
+
+def parse_arguments():
+    """Parses the command line options"""
+    parser = argparse.ArgumentParser(description='Monte-Carlo BER of the precoded duobinary link')
+    points = parser.add_mutually_exclusive_group()
+    points.add_argument('--sigma', nargs='+', type=float, help='noise standard deviations')
+    points.add_argument('--ebn0', nargs='+', type=float, help='Eb/N0 points in dB')
+    parser.add_argument('--target-errors', type=int, default=TARGET_ERRORS)
+    parser.add_argument('--batch-bits', type=int, default=BATCH_BITS)
+    parser.add_argument('--max-bits', type=int, default=MAX_BITS)
+    parser.add_argument('--confidence', type=float, default=CONFIDENCE)
+    parser.add_argument('--seed', type=int, help='root seed (defaults to $SIMULATION_SEED or fresh entropy)')
+    parser.add_argument('--workers', type=int, default=1, help='processes to spread the points over')
+    parser.add_argument('--detector', choices=DETECTORS, default='symbol')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    sigma = args.sigma if args.sigma or args.ebn0 else [0.1, 0.5, 1]
+    seed = root_seed(args.seed)
+    print('Random seed:', seed)
+    results = simulate_ber(sigma, args.ebn0, args.target_errors, args.batch_bits, args.max_bits,
+                           args.confidence, seed, args.detector, args.workers)
+    print_results(results)
+
+if __name__ == '__main__':
+    main()
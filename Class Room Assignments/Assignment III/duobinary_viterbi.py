@@ -0,0 +1,74 @@
+"""Viterbi (maximum-likelihood sequence) detector for the precoded 1 + D duobinary link.
+
+The trellis state is the last precoded symbol p[k] (M states), and each
+received sample b[k] = a[k] + a[k+1] plus noise is one transition, with the
+squared distance to the noise-free output as branch metric. Metrics are
+updated with NumPy for every frame of a (frames, samples) batch at once.
+
+ViterbiDetector streams: it keeps survivors for only the last few
+traceback lengths of samples. Whenever that buffer fills, it traces back
+from the best state and releases every decision older than the traceback
+depth. Data is recovered from the decided precoded symbols as
+d[k] = (p[k] + p[k+1]) % M.
+"""
+import numpy as np
+
+TRACEBACK = 32 # Decision delay, in samples
+CHUNK_SIZE = 4096 # Samples whose branch metrics are computed together
+
+class ViterbiDetector:
+    """Streaming Viterbi detector for M-ary precoded 1 + D signalling over parallel frames"""
+    def __init__(self, M=2, frames=1, traceback=TRACEBACK, initial=0):
+        self.M = M
+        self.frames = frames
+        self.traceback = traceback
+        levels = 2 * np.arange(M) - (M - 1)
+        self.outputs = (levels[:, None] + levels[None, :]).astype(np.float64) # From state (rows) to state (columns)
+        self.metrics = np.full((frames, M), np.inf)
+        self.metrics[:, initial] = 0.0 # The precoder starts from a known symbol
+        self.last_state = np.full(frames, initial, dtype=np.int64) # Latest decided precoded symbol
+        self.survivors = [] # One (frames, M) array of predecessor states per undecided sample
+
+    def _decide(self, count):
+        """Traces back from the best state and releases the oldest count decisions as data"""
+        rows = np.arange(self.frames)
+        state = np.argmin(self.metrics, axis=1)
+        path = np.empty((self.frames, len(self.survivors) + 1), dtype=np.int64)
+        path[:, -1] = state
+        for t in range(len(self.survivors) - 1, -1, -1):
+            state = self.survivors[t][rows, state]
+            path[:, t] = state
+        path[:, 0] = self.last_state # Already decided
+        data = (path[:, :count] + path[:, 1:count + 1]) % self.M
+        self.last_state = path[:, count]
+        del self.survivors[:count]
+        return data
+
+    def process(self, received):
+        """Runs the next (frames, samples) block through the trellis, returning the data decided so far"""
+        received = np.asarray(received, dtype=np.float64).reshape(self.frames, -1)
+        decided = []
+        for start in range(0, received.shape[1], CHUNK_SIZE):
+            chunk = received[:, start:start + CHUNK_SIZE].T
+            branch = (chunk[:, :, None, None] - self.outputs)**2 # (samples, frames, from, to)
+            for t in range(chunk.shape[0]):
+                candidates = self.metrics[:, :, None] + branch[t]
+                predecessors = np.argmin(candidates, axis=1)
+                self.metrics = candidates.min(axis=1)
+                self.survivors.append(predecessors.astype(np.uint8 if self.M <= 256 else np.int64))
+                if len(self.survivors) == 2 * self.traceback:
+                    decided.append(self._decide(self.traceback))
+            self.metrics -= self.metrics.min(axis=1, keepdims=True) # Keep the metrics bounded on long streams
+        return np.concatenate(decided, axis=1) if decided else np.zeros((self.frames, 0), dtype=np.int64)
+
+    def flush(self):
+        """Releases the remaining decisions, tracing back from the best final state"""
+        return self._decide(len(self.survivors))
+
+def viterbi_decode(received, M=2, traceback=TRACEBACK):
+    """Returns the MLSE data decisions for a (samples,) or (frames, samples) received sequence"""
+    received = np.asarray(received, dtype=np.float64)
+    frames = np.atleast_2d(received)
+    detector = ViterbiDetector(M, frames.shape[0], traceback)
+    data = np.concatenate([detector.process(frames), detector.flush()], axis=1)
+    return data.reshape(received.shape)
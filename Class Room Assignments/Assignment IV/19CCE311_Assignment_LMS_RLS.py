@@ -1,7 +1,27 @@
+import argparse
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+import tracemalloc
+import wave
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import scipy.io.wavfile as wav
+from scipy.linalg import blas
+from scipy.signal import get_window
+from numpy.lib.stride_tricks import sliding_window_view
+import adaptive_kernels
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir))
+from random_streams import root_seed, spawn_seeds # Reproducible random-number streams
+
 NOISY_SIGNAL_FILE = 'noisy_speech.wav'
 CLEAN_SIGNAL_FILE = 'clean_speech.wav'
 
@@ -9,12 +29,40 @@ MAX_AMPLITUDE = 32768.0
 NUM_TAPS = 256
 STEP_SIZE = 0.01
 FORGETTING_FACTOR = 0.99
+NLMS_EPSILON = 1e-6
+BLOCK_LMS_SMOOTHING = 0.99 # Forgetting factor of the per-bin input power estimate used by BlockLMSFilter
+SEGMENT_LENGTH = 1024
+SEGMENT_OVERLAP = 512
+SPECTRUM_CACHE_SIZE = 16
+REPORT_POINTS = 4000 # Points per plotted series in headless reports, about the pixel width of a figure
+REPORT_DPI = 100
+Q15_SCALE = 32768 # 1.0 in Q15
+Q15_MIN, Q15_MAX = -32768, 32767
+CHECKPOINT_INTERVAL = 5000
+CONVERGENCE_WINDOW = 2000
+CONVERGENCE_TOLERANCE = 0.1
+CONVERGENCE_PATIENCE = 3
+JIT_TOLERANCE = 1e-8 # Largest relative output difference allowed between a compiled kernel and its filter class
+DTYPE_SNR_THRESHOLDS = { # Smallest output SNR (dB) against float64 accepted from each reduced-precision filter
+    'LMS Q15': 5.0,
+    'LMS float32': 100.0,
+    'NLMS float32': 100.0,
+    'Block LMS float32': 100.0,
+    'RLS float32': 100.0,
+    'In-place RLS float32': 100.0,
+    'Fast RLS float32': 100.0,
+    'Multichannel LMS float32': 100.0,
+    'Multichannel RLS float32': 100.0,
+}
+
+_spectrum_cache = OrderedDict()
+_report_dir = None # Set in headless report mode
 
 class LMSFilter:
-    def __init__(self, num_taps, step_size):
+    def __init__(self, num_taps, step_size, dtype=np.float64):
         self.num_taps = num_taps
         self.step_size = step_size
-        self.weights = np.random.rand(num_taps)
+        self.weights = np.random.rand(num_taps).astype(dtype)
 
     def update(self, signal, target):
         prediction = np.dot(self.weights.T, signal)
@@ -22,12 +70,112 @@ class LMSFilter:
         self.weights += self.step_size * error * signal
         return prediction, error
 
+class NLMSFilter:
+    def __init__(self, num_taps, step_size, epsilon=NLMS_EPSILON, dtype=np.float64):
+        self.num_taps = num_taps
+        self.step_size = step_size
+        self.epsilon = epsilon
+        self.weights = np.random.rand(num_taps).astype(dtype)
+
+    def update(self, signal, target):
+        prediction = np.dot(self.weights.T, signal)
+        error = target - prediction
+        self.weights += self.step_size * error * signal / (self.epsilon + np.dot(signal, signal))
+        return prediction, error
+
+class BlockLMSFilter:
+    """Frequency-domain block LMS filter (overlap-save, block size = num_taps).
+
+    Follows the same convention as LMSFilter: the prediction for target[i] is
+    np.dot(weights, signal[i-num_taps:i]), but whole blocks of num_taps samples
+    are filtered with one FFT convolution and the gradient summed over the block.
+    Each frequency bin of the gradient is normalised by its input power, like NLMS.
+    """
+    def __init__(self, num_taps, step_size, epsilon=NLMS_EPSILON, smoothing=BLOCK_LMS_SMOOTHING, dtype=np.float64):
+        self.num_taps = num_taps
+        self.step_size = step_size
+        self.epsilon = epsilon
+        self.smoothing = smoothing
+        self.dtype = dtype
+        self.history = np.zeros(num_taps, dtype=dtype)
+        self.power = None # Set from the first block
+        self.weights = np.random.rand(num_taps)
+
+    @property
+    def weights(self):
+        return np.fft.irfft(self._W, 2 * self.num_taps)[:self.num_taps][::-1].copy()
+
+    @weights.setter
+    def weights(self, weights):
+        self._W = np.fft.rfft(np.asarray(weights, dtype=self.dtype)[::-1], 2 * self.num_taps)
+
+    def update(self, signal, target):
+        n = self.num_taps
+        count = len(signal)
+        block = np.zeros(n, dtype=self.dtype)
+        block[:count] = signal
+        U = np.fft.rfft(np.concatenate((self.history, block)))
+        prediction = np.fft.irfft(U * self._W, 2 * n)[n-1:2*n-1]
+        padded_error = np.zeros(2 * n, dtype=self.dtype)
+        error = padded_error[n-1:2*n-1]
+        error[:count] = target - prediction[:count]
+        E = np.fft.rfft(padded_error)
+        power = np.abs(U) ** 2 / 2 # num_taps times the input power spectrum, as np.dot(signal, signal) in NLMS
+        if self.power is None:
+            self.power = power
+        else:
+            self.power = self.smoothing * self.power + (1 - self.smoothing) * power
+        gradient = np.fft.irfft(np.conj(U) * E / (self.epsilon + self.power), 2 * n)[:n]
+        self._W += self.step_size * np.fft.rfft(gradient, 2 * n)
+        self.history = block if count == n else np.concatenate((self.history, block[:count]))[-n:]
+        return prediction[:count], error[:count]
+
+    def filter(self, signal, target):
+        """Runs update over a whole signal one block at a time"""
+        prediction = np.zeros(len(signal), dtype=self.dtype)
+        error = np.zeros(len(signal), dtype=self.dtype)
+        for start in range(0, len(signal), self.num_taps):
+            stop = start + self.num_taps
+            prediction[start:stop], error[start:stop] = self.update(signal[start:stop], target[start:stop])
+        return prediction, error
+
+class Q15LMSFilter:
+    """LMS filter emulating a 16-bit fixed-point DSP.
+
+    Inputs, targets, weights, step size and error are Q15 integers; the dot
+    product accumulates in a wide register and every result is rounded back
+    to Q15 and saturated. update takes and returns floats like LMSFilter.
+    """
+    def __init__(self, num_taps, step_size):
+        self.num_taps = num_taps
+        self.step_size = step_size
+        self.step_size_q15 = int(round(step_size * Q15_SCALE))
+        self.weights_q15 = to_q15(np.random.rand(num_taps))
+
+    @property
+    def weights(self):
+        return self.weights_q15 / Q15_SCALE
+
+    @weights.setter
+    def weights(self, weights):
+        self.weights_q15 = to_q15(weights)
+
+    def update(self, signal, target):
+        signal_q15 = to_q15(signal)
+        accumulator = int(np.dot(self.weights_q15, signal_q15)) # Q30
+        prediction_q15 = saturate_q15((accumulator + (1 << 14)) >> 15)
+        error_q15 = saturate_q15(int(to_q15(target)) - prediction_q15)
+        scaled_error = (self.step_size_q15 * error_q15 + (1 << 14)) >> 15
+        self.weights_q15 = np.clip(self.weights_q15 + ((scaled_error * signal_q15 + (1 << 14)) >> 15),
+                                   Q15_MIN, Q15_MAX)
+        return prediction_q15 / Q15_SCALE, error_q15 / Q15_SCALE
+
 class RLSFilter:
-    def __init__(self, num_taps, forgetting_factor):
+    def __init__(self, num_taps, forgetting_factor, dtype=np.float64):
         self.num_taps = num_taps
         self.forgetting_factor = forgetting_factor
-        self.weights = np.random.rand(num_taps)
-        self.P = 1e3 * np.eye(num_taps)
+        self.weights = np.random.rand(num_taps).astype(dtype)
+        self.P = 1e3 * np.eye(num_taps) # float64 whatever the dtype: a float32 P is swamped by rounding at NUM_TAPS
 
     def update(self, signal, target):
         prediction = np.dot(self.weights.T, signal)
@@ -37,6 +185,241 @@ class RLSFilter:
         self.P = (self.P - np.outer(K, np.dot(signal.T, self.P))) / self.forgetting_factor
         return prediction, error
 
+class InPlaceRLSFilter:
+    """Classic RLS with an in-place, symmetric update of P.
+
+    Only the upper triangle of P is kept and updated (BLAS symv/syr rank-1),
+    P is stored as scale * S so the division by the forgetting factor is a
+    scalar operation, and every work vector is preallocated. S shrinks as
+    scale grows, so scale is folded back into S whenever it passes 1/eps.
+    S is float64 whatever the dtype, as P in RLSFilter.
+    """
+    def __init__(self, num_taps, forgetting_factor, dtype=np.float64):
+        self.num_taps = num_taps
+        self.forgetting_factor = forgetting_factor
+        self.weights = np.random.rand(num_taps).astype(dtype)
+        self.scale = 1e3
+        self.rescale_limit = 1 / np.finfo(np.float64).eps
+        self.S = np.eye(num_taps, order='F') # float64 whatever the dtype, as in RLSFilter
+        self._signal = np.zeros(num_taps)
+        self._Ps = np.zeros(num_taps)
+        self._symv, self._syr = blas.get_blas_funcs(('symv', 'syr'), dtype=np.float64)
+        self._axpy = blas.get_blas_funcs('axpy', dtype=dtype)
+
+    @property
+    def P(self):
+        upper = np.triu(self.S)
+        return self.scale * (upper + np.triu(upper, 1).T)
+
+    def update(self, signal, target):
+        self._signal[:] = signal
+        prediction = np.dot(self.weights, self._signal)
+        error = target - prediction
+        self._symv(1.0, self.S, self._signal, 0.0, self._Ps, overwrite_y=1)
+        denominator = self.forgetting_factor + self.scale * np.dot(self._signal, self._Ps)
+        self._axpy(self._Ps, self.weights, a=self.scale * error / denominator)
+        self._syr(-self.scale / denominator, self._Ps, a=self.S, overwrite_a=1)
+        self.scale /= self.forgetting_factor
+        if self.scale > self.rescale_limit:
+            self.S *= self.scale
+            self.scale = 1.0
+        return prediction, error
+
+class FastRLSFilter:
+    """Stabilized fast transversal RLS (FTF) filter, O(num_taps) per update.
+
+    Drop-in for RLSFilter: forward/backward predictors, always run in float64,
+    replace the P matrix. With rescue enabled they are restarted over the
+    current window when they leave their valid range or break the identity
+    conversion * forward_energy = lambda^N * backward_energy.
+    """
+    KAPPA = (1.5, 2.5, 1.0)
+    RESCUE_TOLERANCE = 0.05 # Relative drift from the identity that triggers a restart
+
+    def __init__(self, num_taps, forgetting_factor, rescue=True, initial_energy=1e-3, dtype=np.float64):
+        self.num_taps = num_taps
+        self.forgetting_factor = forgetting_factor
+        self.rescue = rescue
+        self.initial_energy = initial_energy
+        self.weights = np.random.rand(num_taps).astype(dtype)
+        self.rescues = 0
+        self.decay = forgetting_factor**num_taps
+        self.primed = False
+        self.reset_predictors(initial_energy)
+
+    def reset_predictors(self, energy, history=()):
+        """Restarts the forward/backward predictors from an all-zero input history,
+        keeping the filter weights, and runs them over the history samples (oldest first)"""
+        self.regressor = np.zeros(self.num_taps) # Newest sample first
+        self.forward = np.zeros(self.num_taps)
+        self.backward = np.zeros(self.num_taps)
+        self.gain = np.zeros(self.num_taps)
+        self.conversion = 1.0
+        self.forward_energy = energy
+        self.backward_energy = energy / self.decay
+        for sample in history:
+            self.advance(sample)
+
+    def advance(self, sample):
+        """Shifts a new input sample into the predictors and updates the gain vector"""
+        lam = self.forgetting_factor
+        oldest = self.regressor[-1]
+
+        # Forward prediction
+        e_f = sample - np.dot(self.forward, self.regressor)
+        eps_f = e_f * self.conversion
+        scale = e_f / (lam * self.forward_energy)
+        extended = np.empty(self.num_taps + 1)
+        extended[0] = scale
+        extended[1:] = self.gain - scale * self.forward
+        forward_energy = lam * self.forward_energy + e_f * eps_f
+        extended_conversion = lam * self.forward_energy / forward_energy * self.conversion
+        self.forward += self.gain * eps_f
+        self.forward_energy = forward_energy
+
+        # Shift the regressor by one sample
+        self.regressor[1:] = self.regressor[:-1]
+        self.regressor[0] = sample
+
+        # Backward prediction, computed two ways and mixed for stability
+        last = extended[-1]
+        e_b_computed = lam * self.backward_energy * last
+        e_b_direct = oldest - np.dot(self.backward, self.regressor)
+        e_b = [k * e_b_direct + (1 - k) * e_b_computed for k in self.KAPPA]
+        inverse_conversion = 1.0 / extended_conversion - last * e_b[2]
+        self.conversion = 1.0 / inverse_conversion if inverse_conversion != 0 else 0.0
+        self.backward_energy = lam * self.backward_energy + e_b[1]**2 * self.conversion
+        self.gain = extended[:-1] + last * self.backward
+        self.backward += self.gain * e_b[0] * self.conversion
+
+    def healthy(self):
+        """Returns whether the predictor state is still in its valid range and consistent"""
+        return (0 < self.conversion <= 1 and self.forward_energy > 0 and self.backward_energy > 0 and
+                abs(self.conversion * self.forward_energy - self.decay * self.backward_energy)
+                <= self.RESCUE_TOLERANCE * self.decay * self.backward_energy)
+
+    def update(self, signal, target):
+        window = np.asarray(signal, dtype=np.float64) # The predictors see float64 samples whatever the dtype
+        if not self.primed:
+            # The predictors assume an all-zero history, so they are first run
+            # over the rest of the initial window to make their regressor match it
+            self.reset_predictors(self.initial_energy, window[:-1])
+            self.primed = True
+        self.advance(window[-1])
+        if self.rescue and not self.healthy():
+            # Soft restart over the current window, from its energy so the
+            # weights are not thrown off by a near-empty initial covariance
+            self.rescues += 1
+            self.reset_predictors(max(self.initial_energy, np.dot(window, window)), window)
+
+        # Joint-process estimation
+        prediction = np.dot(self.weights, signal)
+        error = target - prediction
+        self.weights += ((error * self.conversion) * self.gain[::-1]).astype(self.weights.dtype)
+        return prediction, error
+
+def to_q15(values):
+    """Rounds floats in [-1, 1) to saturated Q15 integers (held in int64 for headroom)"""
+    return np.clip(np.round(np.asarray(values, dtype=np.float64) * Q15_SCALE), Q15_MIN, Q15_MAX).astype(np.int64)
+
+def saturate_q15(value):
+    """Saturates an integer to the Q15 range"""
+    return min(max(value, Q15_MIN), Q15_MAX)
+
+class MultichannelLMSFilter:
+    """LMSFilter over many independent channels at once.
+
+    weights has shape (channels, num_taps); update takes one window per channel
+    as a (channels, num_taps) array and one target per channel.
+    """
+    def __init__(self, num_channels, num_taps, step_size, dtype=np.float64):
+        self.num_channels = num_channels
+        self.num_taps = num_taps
+        self.step_size = step_size
+        self.weights = np.random.rand(num_channels, num_taps).astype(dtype)
+
+    def update(self, signal, target):
+        prediction = np.einsum('ij,ij->i', self.weights, signal)
+        error = target - prediction
+        self.weights += self.step_size * error[:, None] * signal
+        return prediction, error
+
+class MultichannelRLSFilter:
+    """RLSFilter over many independent channels, with P of shape (channels, num_taps, num_taps)"""
+    def __init__(self, num_channels, num_taps, forgetting_factor, dtype=np.float64):
+        self.num_channels = num_channels
+        self.num_taps = num_taps
+        self.forgetting_factor = forgetting_factor
+        self.weights = np.random.rand(num_channels, num_taps).astype(dtype)
+        self.P = 1e3 * np.tile(np.eye(num_taps), (num_channels, 1, 1)) # float64 whatever the dtype, as in RLSFilter
+
+    def update(self, signal, target):
+        prediction = np.einsum('ij,ij->i', self.weights, signal)
+        error = target - prediction
+        Ps = np.matmul(self.P, signal[:, :, None])[:, :, 0]
+        sP = np.matmul(signal[:, None, :], self.P)[:, 0, :] # Not taken from Ps, as rounding leaves P slightly asymmetric
+        K = Ps / (self.forgetting_factor + np.einsum('ij,ij->i', signal, Ps))[:, None]
+        self.weights += K * error[:, None]
+        self.P -= K[:, :, None] * sP[:, None, :]
+        self.P /= self.forgetting_factor
+        return prediction, error
+
+class ConvergenceMonitor:
+    """Flags convergence once the error variance of consecutive windows stops changing.
+
+    update is fed one error per sample and returns True when the variance of
+    the last `patience` windows each stayed within `tolerance` (relative) of
+    the window before.
+    """
+    def __init__(self, window=CONVERGENCE_WINDOW, tolerance=CONVERGENCE_TOLERANCE, patience=CONVERGENCE_PATIENCE):
+        self.window = window
+        self.tolerance = tolerance
+        self.patience = patience
+        self.errors = np.zeros(window)
+        self.count = 0
+        self.previous_variance = None
+        self.stable_windows = 0
+
+    def update(self, error):
+        self.errors[self.count % self.window] = error
+        self.count += 1
+        if self.count % self.window:
+            return False
+        variance = np.var(self.errors)
+        if self.previous_variance is not None and abs(variance - self.previous_variance) <= self.tolerance * self.previous_variance:
+            self.stable_windows += 1
+        else:
+            self.stable_windows = 0
+        self.previous_variance = variance
+        return self.stable_windows >= self.patience
+
+# Filters whose update time is dominated by BLAS calls that release the GIL
+BLAS_BOUND_FILTERS = (RLSFilter, InPlaceRLSFilter, MultichannelRLSFilter)
+
+class TapDelayLine:
+    """Circular tap-delay line for sample-at-a-time input.
+
+    Every sample is written twice into a backing array of 2 * num_taps, so the
+    current window (oldest sample first) is always a contiguous zero-copy view.
+    """
+    def __init__(self, num_taps, dtype=np.float64):
+        self.num_taps = num_taps
+        self.buffer = np.zeros(2 * num_taps, dtype=dtype)
+        self.index = 0
+
+    def push(self, sample):
+        self.buffer[self.index] = self.buffer[self.index + self.num_taps] = sample
+        self.index = (self.index + 1) % self.num_taps
+        return self.window
+
+    @property
+    def window(self):
+        return self.buffer[self.index:self.index + self.num_taps]
+
+def tap_delay_line(signal, num_taps):
+    """Returns zero-copy windows of a signal, row j being signal[j:j+num_taps], the window for sample j+num_taps"""
+    return sliding_window_view(signal, num_taps, axis=-1)[..., :-1, :]
+
 def read_audio_file(file_name):
     """Reads an audio file and returns the sampling rate and signal data."""
     with open(file_name, 'rb') as file:
@@ -44,6 +427,30 @@ def read_audio_file(file_name):
     signal = signal.astype(np.float32) / MAX_AMPLITUDE
     return rate, signal
 
+def read_audio_chunks(file_name, chunk_size, num_samples=None):
+    """Yields fixed-size chunks of a memory-mapped audio file, zero padded up to num_samples"""
+    rate, signal = wav.read(file_name, mmap=True)
+    if num_samples is None:
+        num_samples = len(signal)
+    for start in range(0, num_samples, chunk_size):
+        chunk = np.zeros(min(chunk_size, num_samples - start), dtype=np.float32)
+        available = signal[start:start + len(chunk)]
+        chunk[:len(available)] = available.astype(np.float32) / MAX_AMPLITUDE
+        yield chunk
+
+def open_audio_writer(file_name, rate):
+    """Opens a mono 16-bit WAV file for incremental writing"""
+    file = wave.open(file_name, 'wb')
+    file.setnchannels(1)
+    file.setsampwidth(2)
+    file.setframerate(rate)
+    return file
+
+def write_audio_chunk(file, chunk):
+    """Appends a chunk of normalized samples to an open WAV file"""
+    samples = np.clip(chunk * MAX_AMPLITUDE, -MAX_AMPLITUDE, MAX_AMPLITUDE - 1)
+    file.writeframes(samples.astype('<i2').tobytes())
+
 def get_magnitude_spectrum(signal, rate):
     """Returns the magnitude spectrum of a signal"""
     freqs, spectrum = signal_spectrum(signal, rate)
@@ -51,57 +458,220 @@ def get_magnitude_spectrum(signal, rate):
     return freqs, magnitudes
 
 def signal_spectrum(signal, rate):
-    """Returns the frequency and spectrum of a signal"""
+    """Returns the frequency and spectrum of a signal.
+
+    Results are cached by signal content (least recently used entries are
+    dropped beyond SPECTRUM_CACHE_SIZE) and returned read-only.
+    """
+    signal = np.ascontiguousarray(signal)
+    key = (hashlib.blake2b(signal.view(np.uint8)).hexdigest(), signal.dtype.str, signal.shape, rate)
+    if key in _spectrum_cache:
+        _spectrum_cache.move_to_end(key)
+        return _spectrum_cache[key]
+
     n = len(signal)
-    k = np.arange(n)
+    k = np.arange(n//2)
     t = n/rate
-    freqs = k/t # two sides frequency range
-    freqs = freqs[:n//2] # one side frequency range
-    sp = np.fft.fft(signal)/n # fft computing and normalization
-    sp = sp[:n//2]
+    freqs = k/t # one side frequency range
+    if np.iscomplexobj(signal):
+        sp = np.fft.fft(signal)[:n//2]/n # fft computing and normalization
+    else:
+        sp = np.fft.rfft(signal)[:n//2]/n # only the one side bins of a real signal
+    freqs.setflags(write=False)
+    sp.setflags(write=False)
+
+    _spectrum_cache[key] = freqs, sp
+    if len(_spectrum_cache) > SPECTRUM_CACHE_SIZE:
+        _spectrum_cache.popitem(last=False)
     return freqs, sp
 
+def stft_frames(chunks, segment_length=SEGMENT_LENGTH, overlap=SEGMENT_OVERLAP):
+    """Yields the rfft of successive Hann-windowed segments of a signal given as an array or chunks.
+
+    Each segment has its mean removed before windowing, as scipy.signal does
+    by default (detrend='constant'). Only the samples of an incomplete segment
+    are carried between chunks, so memory is bounded by the chunk and segment
+    sizes, not the signal length.
+    """
+    if isinstance(chunks, np.ndarray):
+        chunks = [chunks]
+    window = get_window('hann', segment_length)
+    step = segment_length - overlap
+    buffer = np.zeros(0)
+    for chunk in chunks:
+        buffer = np.concatenate((buffer, chunk))
+        if len(buffer) < segment_length:
+            continue
+        count = (len(buffer) - segment_length) // step + 1
+        frames = sliding_window_view(buffer, segment_length)[::step][:count]
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        for spectrum in np.fft.rfft(frames * window, axis=1):
+            yield spectrum
+        buffer = buffer[count * step:]
+
+def power_scale(rate, segment_length):
+    """Returns the one-sided power spectral density scaling of a Hann-windowed segment"""
+    window = get_window('hann', segment_length)
+    scale = np.full(segment_length // 2 + 1, 2.0 / (rate * np.sum(window**2)))
+    scale[0] /= 2
+    if segment_length % 2 == 0:
+        scale[-1] /= 2
+    return scale
+
+def welch_psd(chunks, rate, segment_length=SEGMENT_LENGTH, overlap=SEGMENT_OVERLAP):
+    """Returns the frequencies and Welch-averaged power spectral density of a signal or chunks,
+    as scipy.signal.welch does with its default Hann window and constant detrending"""
+    total = np.zeros(segment_length // 2 + 1)
+    count = 0
+    for spectrum in stft_frames(chunks, segment_length, overlap):
+        total += np.abs(spectrum)**2
+        count += 1
+    freqs = np.fft.rfftfreq(segment_length, 1 / rate)
+    return freqs, total * power_scale(rate, segment_length) / max(count, 1)
+
+def spectrogram(chunks, rate, segment_length=SEGMENT_LENGTH, overlap=SEGMENT_OVERLAP):
+    """Returns the segment times, frequencies and (segments, frequencies) power of a signal or chunks"""
+    scale = power_scale(rate, segment_length)
+    power = np.array([np.abs(spectrum)**2 * scale for spectrum in stft_frames(chunks, segment_length, overlap)])
+    step = segment_length - overlap
+    times = (segment_length / 2 + step * np.arange(len(power))) / rate
+    return times, np.fft.rfftfreq(segment_length, 1 / rate), power
+
+def decimate_envelope(values, x=None, num_points=REPORT_POINTS):
+    """Reduces a long series to the min/max envelope of num_points // 2 bins, returning (x, values)"""
+    if x is None:
+        x = np.arange(len(values))
+    bins = num_points // 2
+    if len(values) <= num_points:
+        return x, values
+    size = len(values) // bins
+    blocks = values[:bins * size].reshape(bins, size)
+    low = np.argmin(blocks, axis=1)
+    high = np.argmax(blocks, axis=1)
+    index = np.sort(np.stack((low, high), axis=1), axis=1) + size * np.arange(bins)[:, None]
+    index = np.append(index.ravel(), np.arange(bins * size, len(values)))
+    return x[index], values[index]
+
+def plot_line(ax, *args, **kwargs):
+    """ax.plot(y) or ax.plot(x, y), decimated to a min/max envelope in headless report mode"""
+    x, y = (None, args[0]) if len(args) == 1 else args
+    if _report_dir is not None:
+        x, y = decimate_envelope(np.asarray(y), None if x is None else np.asarray(x))
+    return ax.plot(y, **kwargs) if x is None else ax.plot(x, y, **kwargs)
+
+def show_figure(fig, name):
+    """Shows a figure, or saves it into the report directory in headless report mode"""
+    if _report_dir is None:
+        plt.show()
+    else:
+        fig.savefig(os.path.join(_report_dir, name.lower().replace(' ', '_') + '.png'), dpi=REPORT_DPI)
+        plt.close(fig)
+
+def seed_spectrum_cache(spectra):
+    """Report worker initializer: starts the spectrum cache from the parent's entries"""
+    for key, (freqs, sp) in spectra.items():
+        freqs.setflags(write=False)
+        sp.setflags(write=False)
+        _spectrum_cache[key] = freqs, sp
+
+def render_report_figure(report_dir, plot_function, plot_args):
+    """Report worker: renders one figure with the Agg backend into report_dir"""
+    global _report_dir
+    plt.switch_backend('Agg')
+    _report_dir = report_dir
+    plot_function(*plot_args)
+
+def render_figures(figures, report_dir=None, workers=None):
+    """Draws (plot_function, args) figures interactively, or headlessly into report_dir.
+
+    Headless figures are rendered in parallel worker processes, or in this
+    process when workers is 1 (e.g. for arguments that cannot be pickled).
+    Workers start from this process's spectrum cache, so spectra computed
+    here beforehand are not recomputed by every figure that plots them.
+    """
+    if report_dir is None:
+        for plot_function, plot_args in figures:
+            plot_function(*plot_args)
+        return
+    os.makedirs(report_dir, exist_ok=True)
+    if workers == 1:
+        for plot_function, plot_args in figures:
+            render_report_figure(report_dir, plot_function, plot_args)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=seed_spectrum_cache,
+                             initargs=(dict(_spectrum_cache),)) as executor:
+        futures = [executor.submit(render_report_figure, report_dir, plot_function, plot_args)
+                   for plot_function, plot_args in figures]
+        for future in futures:
+            future.result()
+
+def plot_welch_psd(signals, labels, rate, segment_length=SEGMENT_LENGTH, overlap=SEGMENT_OVERLAP):
+    """Plots the Welch power spectral density of several signals (arrays or chunk iterables)"""
+    fig, ax = plt.subplots(figsize=(12, 8))
+    for signal, label in zip(signals, labels):
+        freqs, psd = welch_psd(signal, rate, segment_length, overlap)
+        plot_line(ax, freqs, psd, label=label)
+    ax.set_yscale('log')
+    ax.set_xlabel('Frequency (Hz)')
+    ax.set_ylabel('PSD (1/Hz)')
+    ax.set_title('Welch Power Spectral Density')
+    ax.legend()
+    plt.tight_layout()
+    show_figure(fig, 'welch_psd')
+
+def plot_spectrogram(signal, rate, title, segment_length=SEGMENT_LENGTH, overlap=SEGMENT_OVERLAP):
+    """Plots the STFT spectrogram of a signal (array or chunk iterable) in dB"""
+    times, freqs, power = spectrogram(signal, rate, segment_length, overlap)
+    fig, ax = plt.subplots(figsize=(12, 8))
+    mesh = ax.pcolormesh(times, freqs, 10 * np.log10(power.T + np.finfo(float).tiny), shading='auto')
+    fig.colorbar(mesh, ax=ax, label='Power (dB/Hz)')
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Frequency (Hz)')
+    ax.set_title(title + ' Spectrogram')
+    plt.tight_layout()
+    show_figure(fig, title + '_spectrogram')
+
 def plot_signal_and_spectrum(signal, rate, title):
     """Plots the signal and its frequency spectrum"""
     
     fig, axs = plt.subplots(2, 1, figsize=(12, 8))
-    axs[0].plot(signal)
+    plot_line(axs[0], signal)
     axs[0].set_xlabel('Time (s)')
     axs[0].set_ylabel('Amplitude')
     axs[0].set_title(title + ' Audio Signal')
     
     freqs, magnitudes = get_magnitude_spectrum(signal, rate)
-    axs[1].plot(freqs, magnitudes)
+    plot_line(axs[1], freqs, magnitudes)
     axs[1].set_xlabel('Frequency (Hz)')
     axs[1].set_ylabel('Magnitude')
     axs[1].set_title(title + ' Magnitude Spectrum')
     
     plt.tight_layout()
-    plt.show()
+    show_figure(fig, title + '_signal_and_spectrum')
 
 def plot_filter_responses(filtered_signal, signal, rate, title):
     """Plots the filter response and the filtered signal"""
     
     fig, axs = plt.subplots(2, 1, figsize=(12, 8))
-    axs[0].plot(signal, label='Original Signal', alpha=0.5)
-    axs[0].plot(filtered_signal, label='Filtered Signal')
+    plot_line(axs[0], signal, label='Original Signal', alpha=0.5)
+    plot_line(axs[0], filtered_signal, label='Filtered Signal')
     axs[0].set_xlabel('Time (s)')
     axs[0].set_ylabel('Amplitude')
     axs[0].set_title(title + ' Filtered Audio Signal')
     axs[0].legend()
     
     freqs, magnitudes = get_magnitude_spectrum(signal, rate)
-    axs[1].plot(freqs, magnitudes, label='Original Spectrum', alpha=0.5)
+    plot_line(axs[1], freqs, magnitudes, label='Original Spectrum', alpha=0.5)
     
     freqs, magnitudes = get_magnitude_spectrum(filtered_signal, rate)
-    axs[1].plot(freqs, magnitudes, label='Filtered Spectrum')
+    plot_line(axs[1], freqs, magnitudes, label='Filtered Spectrum')
     axs[1].set_xlabel('Frequency (Hz)')
     axs[1].set_ylabel('Magnitude')
     axs[1].set_title(title + ' Magnitude Spectrum')
     axs[1].legend()
     
     plt.tight_layout()
-    plt.show()
+    show_figure(fig, title + '_filter_responses')
 
 def plot_histogram(signal, title):
     """Plots the histogram representation of a signal"""
@@ -111,7 +681,359 @@ def plot_histogram(signal, title):
     ax.set_ylabel('Count')
     ax.set_title('Histogram of ' + title + ' Signal')
     plt.tight_layout()
-    plt.show()
+    show_figure(fig, title + '_histogram')
+
+def plot_comparison(clean_signal, noisy_signal, lms_output, rls_output):
+    """Plots the original and filtered signals on one axis"""
+    fig, ax = plt.subplots()
+    plot_line(ax, clean_signal, label='Clean')
+    plot_line(ax, noisy_signal, alpha=0.5, label='Noisy')
+    plot_line(ax, lms_output, label='LMS')
+    plot_line(ax, rls_output, label='RLS')
+    ax.set_title('Comparison of Original and Filtered Signals')
+    ax.legend()
+    show_figure(fig, 'comparison')
+
+def apply_multichannel_filter(adaptive_filter, noisy_signals, clean_signals):
+    """Filters (channels, samples) signals with a multichannel filter, one update per sample for all channels"""
+    num_taps = adaptive_filter.num_taps
+    output = np.zeros(noisy_signals.shape, dtype=np.float64)
+    windows = tap_delay_line(noisy_signals, num_taps)
+    for i in range(num_taps, noisy_signals.shape[1]):
+        output[:, i], _ = adaptive_filter.update(windows[:, i-num_taps], clean_signals[:, i])
+    return output
+
+def benchmark_windowing(signal, num_taps, repeats=3):
+    """Returns the best per-sample time (in seconds) of feeding a dot product from each windowing method"""
+    weights = np.random.rand(num_taps)
+    num_samples = len(signal) - num_taps
+
+    def slicing():
+        for i in range(num_taps, len(signal)):
+            np.dot(weights, signal[i-num_taps:i])
+
+    def sliding_view():
+        for signal_window in tap_delay_line(signal, num_taps):
+            np.dot(weights, signal_window)
+
+    def circular_buffer():
+        delay_line = TapDelayLine(num_taps, signal.dtype)
+        for sample in signal[:num_taps - 1]:
+            delay_line.push(sample)
+        for sample in signal[num_taps - 1:-1]:
+            np.dot(weights, delay_line.push(sample))
+
+    timings = {}
+    for name, method in (('slicing', slicing), ('sliding_window_view', sliding_view), ('circular_buffer', circular_buffer)):
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            method()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best / num_samples
+    return timings
+
+def run_adaptive_filter(adaptive_filter, noisy_signal, clean_signal, use_jit=False):
+    """Runs one filter over a whole signal and returns its output.
+
+    With use_jit the sample loop runs in a compiled kernel from adaptive_kernels
+    (updating the filter's own weights and P); filters without a kernel, or a
+    missing Numba, fall back to calling update once per sample.
+    """
+    output = np.zeros_like(noisy_signal)
+    num_taps = adaptive_filter.num_taps
+    if use_jit and adaptive_kernels.NUMBA_AVAILABLE:
+        signal = np.ascontiguousarray(noisy_signal)
+        target = np.ascontiguousarray(clean_signal)
+        if type(adaptive_filter) is LMSFilter:
+            adaptive_kernels.lms_kernel(signal, target, adaptive_filter.weights, adaptive_filter.step_size, output)
+            return output
+        if type(adaptive_filter) is NLMSFilter:
+            adaptive_kernels.nlms_kernel(signal, target, adaptive_filter.weights, adaptive_filter.step_size,
+                                         adaptive_filter.epsilon, output)
+            return output
+        if type(adaptive_filter) is RLSFilter:
+            adaptive_kernels.rls_kernel(signal, target, adaptive_filter.weights, adaptive_filter.P,
+                                        adaptive_filter.forgetting_factor, output)
+            return output
+    if hasattr(adaptive_filter, 'filter'):
+        adaptive_filter.history[:] = noisy_signal[:num_taps]
+        output[num_taps:], _ = adaptive_filter.filter(noisy_signal[num_taps:], clean_signal[num_taps:])
+        return output
+    windows = tap_delay_line(noisy_signal, num_taps)
+    for i in range(num_taps, len(noisy_signal)):
+        output[i], _ = adaptive_filter.update(windows[i-num_taps], clean_signal[i])
+    return output
+
+def run_filter_worker(adaptive_filter, noisy_signal, clean_signal, use_jit):
+    """Worker: runs one filter over the whole signal and returns its output and final state"""
+    output = run_adaptive_filter(adaptive_filter, noisy_signal, clean_signal, use_jit)
+    return output, adaptive_filter
+
+def run_filters_concurrently(adaptive_filters, noisy_signal, clean_signal, use_jit=False):
+    """Runs each filter's full pass on its own worker and returns their outputs in order.
+
+    Filters that spend their time in BLAS (or in GIL-free compiled kernels) share
+    a thread pool; the rest run in worker processes, and since those work on
+    copies the filters are replaced by their final state in the list.
+    """
+    compiled = use_jit and adaptive_kernels.NUMBA_AVAILABLE
+    threaded = [compiled or isinstance(adaptive_filter, BLAS_BOUND_FILTERS) for adaptive_filter in adaptive_filters]
+    with ThreadPoolExecutor(max_workers=max(1, sum(threaded))) as threads, \
+         ProcessPoolExecutor(max_workers=max(1, len(threaded) - sum(threaded))) as processes:
+        futures = [(threads if in_thread else processes).submit(run_filter_worker, adaptive_filter,
+                                                                noisy_signal, clean_signal, use_jit)
+                   for adaptive_filter, in_thread in zip(adaptive_filters, threaded)]
+        results = [future.result() for future in futures]
+    adaptive_filters[:] = [adaptive_filter for _, adaptive_filter in results]
+    return [output for output, _ in results]
+
+def check_jit_parity(noisy_signal, clean_signal, num_samples=4000):
+    """Returns the largest output difference between each compiled kernel and its NumPy filter class,
+    relative to the peak output, in float64 so the comparison is not limited by float32 outputs"""
+    noisy_signal = noisy_signal[:num_samples].astype(np.float64)
+    clean_signal = clean_signal[:num_samples].astype(np.float64)
+    differences = {}
+    for adaptive_class, parameter in ((LMSFilter, STEP_SIZE), (NLMSFilter, STEP_SIZE), (RLSFilter, FORGETTING_FACTOR)):
+        reference = adaptive_class(NUM_TAPS, parameter)
+        compiled = adaptive_class(NUM_TAPS, parameter)
+        compiled.weights[:] = reference.weights
+        expected = run_adaptive_filter(reference, noisy_signal, clean_signal)
+        actual = run_adaptive_filter(compiled, noisy_signal, clean_signal, use_jit=True)
+        differences[adaptive_class.__name__] = np.max(np.abs(expected - actual)) / np.max(np.abs(expected))
+    return differences
+
+def check_dtype_accuracy(noisy_signal, clean_signal, num_samples=8000, num_taps=NUM_TAPS):
+    """Returns the output SNR (dB) of the float32 and Q15 filters against their float64 reference.
+
+    The signals are first scaled to a peak of 0.5, as a fixed-point front end
+    would scale them, so the Q15 path works on its full range.
+    """
+    scale = 0.5 / max(np.max(np.abs(noisy_signal[:num_samples])), np.max(np.abs(clean_signal[:num_samples])))
+    noisy_signal = noisy_signal[:num_samples] * scale
+    clean_signal = clean_signal[:num_samples] * scale
+    comparisons = [('LMS Q15', LMSFilter(num_taps, STEP_SIZE), Q15LMSFilter(num_taps, STEP_SIZE))]
+    for name, adaptive_class, parameter in (('LMS', LMSFilter, STEP_SIZE), ('NLMS', NLMSFilter, STEP_SIZE),
+                                            ('Block LMS', BlockLMSFilter, STEP_SIZE),
+                                            ('RLS', RLSFilter, FORGETTING_FACTOR),
+                                            ('In-place RLS', InPlaceRLSFilter, FORGETTING_FACTOR),
+                                            ('Fast RLS', FastRLSFilter, FORGETTING_FACTOR)):
+        comparisons.append((name + ' float32', adaptive_class(num_taps, parameter),
+                            adaptive_class(num_taps, parameter, dtype=np.float32)))
+    for name, adaptive_class, parameter in (('Multichannel LMS', MultichannelLMSFilter, STEP_SIZE),
+                                            ('Multichannel RLS', MultichannelRLSFilter, FORGETTING_FACTOR)):
+        comparisons.append((name + ' float32', adaptive_class(1, num_taps, parameter),
+                            adaptive_class(1, num_taps, parameter, dtype=np.float32)))
+    snr = {}
+    for name, reference, reduced in comparisons:
+        reference.weights = reduced.weights.astype(np.float64)
+        dtype = reduced.weights.dtype
+        if isinstance(reduced, (MultichannelLMSFilter, MultichannelRLSFilter)):
+            expected = apply_multichannel_filter(reference, noisy_signal[None].astype(np.float64),
+                                                 clean_signal[None].astype(np.float64))[0]
+            actual = apply_multichannel_filter(reduced, noisy_signal[None].astype(dtype), clean_signal[None].astype(dtype))[0]
+        else:
+            expected = run_adaptive_filter(reference, noisy_signal.astype(np.float64), clean_signal.astype(np.float64))
+            actual = run_adaptive_filter(reduced, noisy_signal.astype(dtype), clean_signal.astype(dtype))
+        snr[name] = 10 * np.log10(np.sum(expected**2) / max(np.sum((expected - actual)**2), np.finfo(float).tiny))
+    return snr
+
+def checkpoint_output_file(file_name):
+    """Returns the raw file that the output of a checkpointed run is appended to"""
+    return file_name + '.output'
+
+def signal_digest(*signals):
+    """Returns a content hash of the signals a checkpointed run is filtering"""
+    digest = hashlib.blake2b()
+    for signal in signals:
+        signal = np.ascontiguousarray(signal)
+        digest.update(signal.dtype.str.encode())
+        digest.update(signal.view(np.uint8))
+    return digest.hexdigest()
+
+def save_checkpoint(file_name, adaptive_filter, position, output, digest):
+    """Appends the output produced since the last checkpoint to the output file, then saves
+    a filter's array and scalar state (weights, P, ...), the resume position and the
+    signal length and digest to .npz"""
+    output_file = checkpoint_output_file(file_name)
+    written = os.path.getsize(output_file) // output.itemsize if os.path.exists(output_file) else 0
+    with open(output_file, 'ab') as file:
+        output[written:position].tofile(file)
+    state = {name: value for name, value in vars(adaptive_filter).items()
+             if isinstance(value, (np.ndarray, np.generic, int, float))}
+    temporary = file_name + '.tmp.npz'
+    np.savez(temporary, filter_class=type(adaptive_filter).__name__, position=position,
+             signal_length=len(output), signal_digest=digest, **{'state_' + name: value for name, value in state.items()})
+    os.replace(temporary, file_name) # A crash while saving keeps the previous checkpoint
+
+def load_checkpoint(file_name, adaptive_filter, output, digest):
+    """Restores a filter and its output from save_checkpoint and returns the position to resume from"""
+    with np.load(file_name) as checkpoint:
+        if str(checkpoint['filter_class']) != type(adaptive_filter).__name__:
+            raise ValueError('%s holds a %s checkpoint, not %s' % (file_name, checkpoint['filter_class'],
+                                                                  type(adaptive_filter).__name__))
+        if int(checkpoint['signal_length']) != len(output) or str(checkpoint['signal_digest']) != digest:
+            raise ValueError('%s was taken on a different signal (%d samples) than the one being filtered (%d samples)'
+                             % (file_name, checkpoint['signal_length'], len(output)))
+        for key in checkpoint.files:
+            if key.startswith('state_'):
+                value = checkpoint[key]
+                setattr(adaptive_filter, key[len('state_'):], value.item() if value.ndim == 0 else value)
+        position = int(checkpoint['position'])
+    with open(checkpoint_output_file(file_name), 'r+b') as file:
+        saved = np.fromfile(file, dtype=output.dtype, count=position)
+        if len(saved) < position:
+            raise ValueError('%s holds %d output samples, the checkpoint needs %d'
+                             % (checkpoint_output_file(file_name), len(saved), position))
+        output[:position] = saved
+        file.truncate(position * output.itemsize) # Drop output appended after the checkpoint was taken
+    return position
+
+def run_with_checkpoints(adaptive_filter, noisy_signal, clean_signal, checkpoint_file=None,
+                         checkpoint_interval=CHECKPOINT_INTERVAL, monitor=None):
+    """Runs a filter sample by sample with periodic checkpoints and optional early freezing.
+
+    An existing checkpoint_file is resumed from if it was taken on the same
+    signals, and the output is appended to checkpoint_output_file(checkpoint_file)
+    at every checkpoint; both files are removed once the run completes. Once the
+    monitor reports convergence, adaptation stops and the remaining samples
+    are produced by one FIR pass with the frozen weights. Returns the output and the sample
+    at which adaptation was frozen (None if it never was).
+    """
+    num_taps = adaptive_filter.num_taps
+    output = np.zeros_like(noisy_signal)
+    start = num_taps
+    frozen_at = None
+    digest = signal_digest(noisy_signal, clean_signal) if checkpoint_file else None
+    if checkpoint_file and os.path.exists(checkpoint_file):
+        start = load_checkpoint(checkpoint_file, adaptive_filter, output, digest)
+    elif checkpoint_file:
+        open(checkpoint_output_file(checkpoint_file), 'wb').close() # Discard the output of an earlier run
+    windows = tap_delay_line(noisy_signal, num_taps)
+    for i in range(start, len(noisy_signal)):
+        output[i], error = adaptive_filter.update(windows[i-num_taps], clean_signal[i])
+        if checkpoint_file and (i + 1 - num_taps) % checkpoint_interval == 0:
+            save_checkpoint(checkpoint_file, adaptive_filter, i + 1, output, digest)
+        if monitor is not None and monitor.update(error):
+            output[i+1:] = windows[i+1-num_taps:] @ adaptive_filter.weights
+            frozen_at = i + 1
+            break
+    if checkpoint_file:
+        # The run is complete, so a later run starts afresh instead of resuming from it
+        for file_name in (checkpoint_file, checkpoint_output_file(checkpoint_file)):
+            if os.path.exists(file_name):
+                os.remove(file_name)
+    return output, frozen_at
+
+def measure_allocations(adaptive_filter, signal, target, num_samples=1000):
+    """Returns the average number of bytes allocated by one filter update"""
+    num_taps = adaptive_filter.num_taps
+    num_samples = min(num_samples, len(signal) - num_taps)
+    total = 0
+    tracemalloc.start()
+    for i in range(num_taps, num_taps + num_samples):
+        signal_window = signal[i-num_taps:i]
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        adaptive_filter.update(signal_window, target[i])
+        total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return total / num_samples
+
+def stream_filter(adaptive_filter, noisy_chunks, clean_chunks):
+    """Filters chunked signals, carrying the tap history across chunk boundaries.
+
+    Yields (filtered, clean) chunk pairs. As in main(), the first num_taps
+    samples of the stream are not filtered and come out as zeros.
+    """
+    num_taps = adaptive_filter.num_taps
+    history = np.zeros(0, dtype=np.float32)
+    for noisy_chunk, clean_chunk in zip(noisy_chunks, clean_chunks):
+        signal = np.concatenate((history, noisy_chunk))
+        offset = len(history)
+        first = max(num_taps, offset)
+        output = np.zeros(len(noisy_chunk), dtype=np.float32)
+        if hasattr(adaptive_filter, 'filter'):
+            if first < len(signal):
+                if offset < num_taps:
+                    adaptive_filter.history[:] = signal[first-num_taps:first]
+                output[first-offset:], _ = adaptive_filter.filter(signal[first:], clean_chunk[first-offset:])
+        elif first < len(signal):
+            windows = tap_delay_line(signal, num_taps)
+            for i in range(first, len(signal)):
+                output[i-offset], _ = adaptive_filter.update(windows[i-num_taps], clean_chunk[i-offset])
+        history = signal[-num_taps:]
+        yield output, clean_chunk
+
+def stream_denoise(noisy_file, clean_file, lms_filter, rls_filter, chunk_size, output_prefix=None):
+    """Denoises a file pair chunk by chunk, optionally writing the outputs as they are produced"""
+    rate, clean_signal = wav.read(clean_file, mmap=True)
+    num_samples = len(clean_signal)
+    noisy_chunks = itertools.tee(read_audio_chunks(noisy_file, chunk_size, num_samples))
+    clean_chunks = itertools.tee(read_audio_chunks(clean_file, chunk_size))
+    lms_stream = stream_filter(lms_filter, noisy_chunks[0], clean_chunks[0])
+    rls_stream = stream_filter(rls_filter, noisy_chunks[1], clean_chunks[1])
+
+    lms_error = rls_error = 0.0
+    with contextlib.ExitStack() as writers: # Closes the output files even if filtering fails
+        if output_prefix is not None:
+            lms_file = writers.enter_context(open_audio_writer(output_prefix + '_lms.wav', rate))
+            rls_file = writers.enter_context(open_audio_writer(output_prefix + '_rls.wav', rate))
+        for (lms_chunk, clean_chunk), (rls_chunk, _) in zip(lms_stream, rls_stream):
+            if output_prefix is not None:
+                write_audio_chunk(lms_file, lms_chunk)
+                write_audio_chunk(rls_file, rls_chunk)
+            lms_error += np.sum((lms_chunk - clean_chunk)**2, dtype=np.float64)
+            rls_error += np.sum((rls_chunk - clean_chunk)**2, dtype=np.float64)
+    return lms_error / num_samples, rls_error / num_samples
+
+def read_manifest(manifest_file):
+    """Returns the (noisy, clean) file pairs listed in a two-column CSV manifest.
+
+    Relative paths are resolved against the manifest's directory; blank lines,
+    lines starting with '#' and a 'noisy,clean' header are skipped.
+    """
+    base = os.path.dirname(os.path.abspath(manifest_file))
+    pairs = []
+    with open(manifest_file, newline='') as file:
+        for row in csv.reader(file):
+            if not row or row[0].startswith('#') or row[:2] == ['noisy', 'clean']:
+                continue
+            pairs.append(tuple(os.path.join(base, name.strip()) for name in row[:2]))
+    return pairs
+
+def denoise_file_pair(noisy_file, clean_file, lms_mode, rls_mode, chunk_size, dtype=np.float64, seed=None):
+    """Batch worker: runs a fresh LMS/RLS filter pair, initialised from the seed's stream, over one file pair"""
+    result = {'noisy_file': noisy_file, 'clean_file': clean_file, 'lms_mse': None, 'rls_mse': None, 'error': ''}
+    try:
+        lms_filter, rls_filter = create_filters(lms_mode, rls_mode, dtype, np.random.default_rng(seed))
+        result['lms_mse'], result['rls_mse'] = stream_denoise(noisy_file, clean_file, lms_filter, rls_filter, chunk_size)
+    except Exception as error:
+        result['error'] = '%s: %s' % (type(error).__name__, error)
+    return result
+
+def run_batch(manifest_file, report_file, lms_mode, rls_mode, chunk_size, workers=None, dtype=np.float64, seed=None):
+    """Denoises every file pair of a manifest over a process pool and writes a CSV or JSON report.
+
+    The filters of each pair are initialised from the random_streams stream
+    keyed by the pair's index, so a report is reproducible from the seed
+    whatever the number of workers.
+    """
+    pairs = read_manifest(manifest_file)
+    seeds = spawn_seeds(len(pairs), seed)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(denoise_file_pair, noisy_file, clean_file, lms_mode, rls_mode, chunk_size, dtype,
+                                   pair_seed) for (noisy_file, clean_file), pair_seed in zip(pairs, seeds)]
+        results = [future.result() for future in futures]
+
+    with open(report_file, 'w', newline='') as file:
+        if report_file.endswith('.json'):
+            json.dump(results, file, indent=2)
+        else:
+            writer = csv.DictWriter(file, fieldnames=['noisy_file', 'clean_file', 'lms_mse', 'rls_mse', 'error'])
+            writer.writeheader()
+            writer.writerows(results)
+    return results
 
 def pad_audio_signal(signal, target_len):
     """Pads an audio signal with zeros to match a target length."""
@@ -120,33 +1042,179 @@ def pad_audio_signal(signal, target_len):
         signal = np.pad(signal, (0, padding), mode='constant')
     return signal[:target_len]
 
+def create_filters(lms_mode, rls_mode, dtype=np.float64, rng=None):
+    """Returns a new (LMS, RLS) filter pair for the selected modes and floating-point dtype,
+    with initial weights drawn from rng if given, else from the global np.random state"""
+    lms_filters = {'sample': LMSFilter, 'nlms': NLMSFilter, 'block': BlockLMSFilter}
+    rls_filters = {'classic': RLSFilter, 'inplace': InPlaceRLSFilter, 'fast': FastRLSFilter}
+    if lms_mode == 'q15':
+        lms_filter = Q15LMSFilter(NUM_TAPS, STEP_SIZE)
+    else:
+        lms_filter = lms_filters[lms_mode](NUM_TAPS, STEP_SIZE, dtype=dtype)
+    rls_filter = rls_filters[rls_mode](NUM_TAPS, FORGETTING_FACTOR, dtype=dtype)
+    if rng is not None:
+        for adaptive_filter in (lms_filter, rls_filter):
+            adaptive_filter.weights = rng.random(NUM_TAPS).astype(dtype)
+    return lms_filter, rls_filter
+
+def parse_arguments():
+    """Parses the command line options"""
+    parser = argparse.ArgumentParser(description='Speech denoising with LMS and RLS adaptive filters')
+    parser.add_argument('--lms-mode', choices=['sample', 'nlms', 'block', 'q15'], default='sample',
+                        help='per-sample LMS, normalised LMS, frequency-domain block LMS or Q15 fixed-point LMS')
+    parser.add_argument('--rls-mode', choices=['classic', 'inplace', 'fast'], default='classic',
+                        help='O(N^2) RLS, in-place symmetric O(N^2) RLS or O(N) stabilized fast transversal RLS')
+    parser.add_argument('--dtype', choices=['float64', 'float32'], default='float64',
+                        help='floating-point type of the filter weights and state')
+    parser.add_argument('--check-dtype', action='store_true',
+                        help='report the accuracy of the float32 and Q15 filters against float64 and exit, '
+                             'with a non-zero status if any is below its DTYPE_SNR_THRESHOLDS entry')
+    parser.add_argument('--report-allocations', action='store_true',
+                        help='print the bytes allocated per sample by each filter update')
+    parser.add_argument('--stream', action='store_true',
+                        help='process the audio files in chunks with bounded memory and skip the plots')
+    parser.add_argument('--chunk-size', type=int, default=16384,
+                        help='samples per chunk in streaming mode')
+    parser.add_argument('--output-prefix', default='denoised',
+                        help='prefix of the WAV files written in streaming mode')
+    parser.add_argument('--jit', action='store_true',
+                        help='run the LMS, NLMS and classic RLS sample loops in compiled Numba kernels')
+    parser.add_argument('--concurrent', action='store_true',
+                        help='run the LMS and RLS passes on separate workers instead of one interleaved loop')
+    parser.add_argument('--checkpoint', metavar='FILE',
+                        help='periodically save the RLS state to this .npz file (and its output to FILE.output), '
+                             'resume from it if an interrupted run left it, and remove both once the run completes')
+    parser.add_argument('--checkpoint-interval', type=int, default=CHECKPOINT_INTERVAL,
+                        help='samples between RLS checkpoints')
+    parser.add_argument('--freeze-on-convergence', action='store_true',
+                        help='stop adapting the RLS filter once its error variance stabilises')
+    parser.add_argument('--check-jit', action='store_true',
+                        help='compare the compiled kernels against the NumPy filter classes and exit, '
+                             'with a non-zero status if any differs by more than JIT_TOLERANCE')
+    parser.add_argument('--benchmark-windows', action='store_true',
+                        help='time the per-sample windowing overhead of slicing, sliding views and a circular buffer')
+    parser.add_argument('--spectrum', choices=['fft', 'welch'], default='fft',
+                        help='plot whole-signal FFT magnitudes or Welch PSDs and STFT spectrograms')
+    parser.add_argument('--segment-length', type=int, default=SEGMENT_LENGTH,
+                        help='segment length of the Welch/STFT analysis')
+    parser.add_argument('--overlap', type=int, default=SEGMENT_OVERLAP,
+                        help='overlap between Welch/STFT segments')
+    parser.add_argument('--report-dir',
+                        help='render the figures headlessly as PNG files into this directory instead of showing them')
+    parser.add_argument('--batch', metavar='MANIFEST',
+                        help='CSV manifest of noisy,clean file pairs to denoise in parallel')
+    parser.add_argument('--report', default='batch_report.csv',
+                        help='CSV or JSON (.json) file receiving the per-file MSE of a batch run')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes for a batch run (default: all cores)')
+    parser.add_argument('--seed', type=int,
+                        help='root seed of a batch run (defaults to $SIMULATION_SEED or fresh entropy)')
+    return parser.parse_args()
+
 def main():
-    # Load audio signals
+    args = parse_arguments()
+
+    if args.batch:
+        seed = root_seed(args.seed)
+        print('Random seed:', seed)
+        results = run_batch(args.batch, args.report, args.lms_mode, args.rls_mode, args.chunk_size, args.workers,
+                            np.dtype(args.dtype), seed)
+        failed = sum(1 for result in results if result['error'])
+        print('Processed %d file pairs (%d failed), report written to %s' % (len(results), failed, args.report))
+        return
+
+    # Initialize filters
+    lms_filter, rls_filter = create_filters(args.lms_mode, args.rls_mode, np.dtype(args.dtype))
+
+    if args.stream:
+        lms_error, rls_error = stream_denoise(NOISY_SIGNAL_FILE, CLEAN_SIGNAL_FILE, lms_filter, rls_filter,
+                                              args.chunk_size, args.output_prefix)
+        print('LMS error: %.2f' % lms_error)
+        print('RLS error: %.2f' % rls_error)
+
+        # Spectral analysis reads the files back chunk by chunk (chunk generators
+        # cannot be sent to worker processes, so a report is rendered in-process)
+        if args.spectrum == 'welch':
+            rate = wav.read(CLEAN_SIGNAL_FILE, mmap=True)[0]
+            files = [CLEAN_SIGNAL_FILE, NOISY_SIGNAL_FILE, args.output_prefix + '_lms.wav', args.output_prefix + '_rls.wav']
+            figures = [(plot_welch_psd, ([read_audio_chunks(file, args.chunk_size) for file in files],
+                                         ['Clean', 'Noisy', 'LMS', 'RLS'], rate, args.segment_length, args.overlap)),
+                       (plot_spectrogram, (read_audio_chunks(files[3], args.chunk_size), rate, 'RLS',
+                                           args.segment_length, args.overlap))]
+            render_figures(figures, args.report_dir, workers=1)
+        return
+
+    # Load audio signals, normalized to a maximum amplitude of 1 as in streaming mode
     rate, noisy_signal = read_audio_file(NOISY_SIGNAL_FILE)
     rate, clean_signal = read_audio_file(CLEAN_SIGNAL_FILE)
 
-    # Normalize signals to have maximum amplitude of 1
-    noisy_signal = noisy_signal.astype(np.float32) / MAX_AMPLITUDE
-    clean_signal = clean_signal.astype(np.float32) / MAX_AMPLITUDE
-
     # Pad signals with zeros to match length
     noisy_signal = pad_audio_signal(noisy_signal, len(clean_signal))
     clean_signal = pad_audio_signal(clean_signal, len(noisy_signal))
 
-    # Initialize filters
-    lms_filter = LMSFilter(NUM_TAPS, STEP_SIZE)
-    rls_filter = RLSFilter(NUM_TAPS, FORGETTING_FACTOR)
+    if args.check_dtype:
+        snr = check_dtype_accuracy(noisy_signal, clean_signal)
+        for name, value in snr.items():
+            print('%s: %.1f dB output SNR against float64 (threshold %.0f dB)' % (name, value, DTYPE_SNR_THRESHOLDS[name]))
+        failed = [name for name, value in snr.items() if not value >= DTYPE_SNR_THRESHOLDS[name]]
+        if failed:
+            raise SystemExit('Below the DTYPE_SNR_THRESHOLDS output SNR: %s' % ', '.join(failed))
+        return
+
+    if args.check_jit:
+        if not adaptive_kernels.NUMBA_AVAILABLE:
+            print('Numba is not installed, the NumPy filter classes are used')
+            return
+        differences = check_jit_parity(noisy_signal, clean_signal)
+        for name, difference in differences.items():
+            print('%s: max relative output difference %.3g' % (name, difference))
+        failed = [name for name, difference in differences.items() if not difference <= JIT_TOLERANCE]
+        if failed:
+            raise SystemExit('Compiled kernels differ from their filter classes by more than %g: %s'
+                             % (JIT_TOLERANCE, ', '.join(failed)))
+        return
+
+    if args.jit and not adaptive_kernels.NUMBA_AVAILABLE:
+        print('Numba is not installed, falling back to the NumPy filter classes')
+
+    if args.benchmark_windows:
+        for name, seconds in benchmark_windowing(noisy_signal, NUM_TAPS).items():
+            print('%s: %.2f us per sample' % (name, seconds * 1e6))
+
+    # Measure allocations on separate filter instances
+    if args.report_allocations:
+        for name, adaptive_filter in zip(('LMS', 'RLS'), create_filters('sample', args.rls_mode)):
+            print('%s bytes allocated per sample: %.0f' % (name, measure_allocations(adaptive_filter, noisy_signal, clean_signal)))
 
     # Apply filters to noisy signal
-    lms_output = np.zeros_like(noisy_signal)
-    rls_output = np.zeros_like(noisy_signal)
-    for i in range(NUM_TAPS, len(noisy_signal)):
-        signal_window = noisy_signal[i-NUM_TAPS:i]
-        target = clean_signal[i]
-        y_lms, e_lms = lms_filter.update(signal_window, target)
-        y_rls, e_rls = rls_filter.update(signal_window, target)
-        lms_output[i] = y_lms
-        rls_output[i] = y_rls
+    if args.checkpoint or args.freeze_on_convergence:
+        lms_output = run_adaptive_filter(lms_filter, noisy_signal, clean_signal, args.jit)
+        monitor = ConvergenceMonitor() if args.freeze_on_convergence else None
+        rls_output, frozen_at = run_with_checkpoints(rls_filter, noisy_signal, clean_signal, args.checkpoint,
+                                                     args.checkpoint_interval, monitor)
+        if frozen_at is not None:
+            print('RLS converged, adaptation frozen at sample %d' % frozen_at)
+    elif args.concurrent:
+        adaptive_filters = [lms_filter, rls_filter]
+        lms_output, rls_output = run_filters_concurrently(adaptive_filters, noisy_signal, clean_signal, args.jit)
+        lms_filter, rls_filter = adaptive_filters
+    elif args.jit:
+        lms_output = run_adaptive_filter(lms_filter, noisy_signal, clean_signal, use_jit=True)
+        rls_output = run_adaptive_filter(rls_filter, noisy_signal, clean_signal, use_jit=True)
+    else:
+        lms_output = np.zeros_like(noisy_signal)
+        rls_output = np.zeros_like(noisy_signal)
+        if args.lms_mode == 'block':
+            lms_output = run_adaptive_filter(lms_filter, noisy_signal, clean_signal)
+        windows = tap_delay_line(noisy_signal, NUM_TAPS)
+        for i in range(NUM_TAPS, len(noisy_signal)):
+            signal_window = windows[i-NUM_TAPS]
+            target = clean_signal[i]
+            if args.lms_mode != 'block':
+                y_lms, e_lms = lms_filter.update(signal_window, target)
+                lms_output[i] = y_lms
+            y_rls, e_rls = rls_filter.update(signal_window, target)
+            rls_output[i] = y_rls
 
     # Ensure both arrays have the same length
     min_len = min(len(lms_output), len(clean_signal))
@@ -160,26 +1228,24 @@ def main():
     print('RLS error: %.2f' % rls_error)
 
     # Plot results
-    plot_signal_and_spectrum(clean_signal, rate, 'Clean')
-    plot_signal_and_spectrum(noisy_signal, rate, 'Noisy')
-    
-    plot_signal_and_spectrum(lms_output, rate, 'LMS')
-    plot_signal_and_spectrum(rls_output, rate, 'RLS')
-    
-    plot_filter_responses(lms_output, noisy_signal, rate, 'LMS')
-    plot_filter_responses(rls_output, noisy_signal, rate, 'RLS')
-    
-    plot_histogram(clean_signal, 'Clean')
-    plot_histogram(noisy_signal, 'Noisy')
-
-    # Plot comparison of original and filtered signals
-    plt.plot(clean_signal, label='Clean')
-    plt.plot(noisy_signal, alpha=0.5, label='Noisy')
-    plt.plot(lms_output, label='LMS')
-    plt.plot(rls_output, label='RLS')
-    plt.title('Comparison of Original and Filtered Signals')
-    plt.legend()
-    plt.show()
+    if args.spectrum == 'welch':
+        figures = [(plot_welch_psd, ([clean_signal, noisy_signal, lms_output, rls_output],
+                                     ['Clean', 'Noisy', 'LMS', 'RLS'], rate, args.segment_length, args.overlap))]
+        for signal, title in ((noisy_signal, 'Noisy'), (lms_output, 'LMS'), (rls_output, 'RLS')):
+            figures.append((plot_spectrogram, (signal, rate, title, args.segment_length, args.overlap)))
+    else:
+        for signal in (clean_signal, noisy_signal, lms_output, rls_output):
+            signal_spectrum(signal, rate) # Computed once here instead of in each figure's worker
+        figures = [(plot_signal_and_spectrum, (clean_signal, rate, 'Clean')),
+                   (plot_signal_and_spectrum, (noisy_signal, rate, 'Noisy')),
+                   (plot_signal_and_spectrum, (lms_output, rate, 'LMS')),
+                   (plot_signal_and_spectrum, (rls_output, rate, 'RLS')),
+                   (plot_filter_responses, (lms_output, noisy_signal, rate, 'LMS')),
+                   (plot_filter_responses, (rls_output, noisy_signal, rate, 'RLS'))]
+    figures += [(plot_histogram, (clean_signal, 'Clean')),
+                (plot_histogram, (noisy_signal, 'Noisy')),
+                (plot_comparison, (clean_signal, noisy_signal, lms_output, rls_output))]
+    render_figures(figures, args.report_dir, args.workers)
     
 if __name__ == '__main__':
     main()
@@ -0,0 +1,84 @@
+"""Compiled sample loops for the LMS, NLMS and RLS filters of 19CCE311_Assignment_LMS_RLS.py.
+
+Each kernel runs a whole signal through one filter in compiled code, updating
+the filter's weights (and P) arrays in place, with the same window convention
+as main(): the prediction for target[i] uses signal[i-num_taps:i]. Numba is
+optional; without it NUMBA_AVAILABLE is False and the kernels stay plain
+(slow) Python, so callers should fall back to the NumPy filter classes.
+Compiled kernels release the GIL, so several can run on a thread pool.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def jit(function):
+    """Compiles a kernel with Numba when it is installed"""
+    if NUMBA_AVAILABLE:
+        return njit(cache=True, nogil=True)(function)
+    return function
+
+@jit
+def lms_kernel(signal, target, weights, step_size, output):
+    """Runs the LMS update over every sample"""
+    num_taps = weights.shape[0]
+    for i in range(num_taps, signal.shape[0]):
+        window = signal[i-num_taps:i]
+        prediction = 0.0
+        for k in range(num_taps):
+            prediction += weights[k] * window[k]
+        error = target[i] - prediction
+        for k in range(num_taps):
+            weights[k] += step_size * error * window[k]
+        output[i] = prediction
+
+@jit
+def nlms_kernel(signal, target, weights, step_size, epsilon, output):
+    """Runs the normalised LMS update over every sample"""
+    num_taps = weights.shape[0]
+    for i in range(num_taps, signal.shape[0]):
+        window = signal[i-num_taps:i]
+        prediction = 0.0
+        energy = 0.0
+        for k in range(num_taps):
+            prediction += weights[k] * window[k]
+            energy += window[k] * window[k]
+        error = target[i] - prediction
+        scale = step_size * error / (epsilon + energy)
+        for k in range(num_taps):
+            weights[k] += scale * window[k]
+        output[i] = prediction
+
+@jit
+def rls_kernel(signal, target, weights, P, forgetting_factor, output):
+    """Runs the RLS update over every sample, updating P in place"""
+    num_taps = weights.shape[0]
+    Px = np.zeros(num_taps)
+    xP = np.zeros(num_taps)
+    inverse_factor = 1.0 / forgetting_factor
+    for i in range(num_taps, signal.shape[0]):
+        window = signal[i-num_taps:i]
+        prediction = 0.0
+        for k in range(num_taps):
+            prediction += weights[k] * window[k]
+        error = target[i] - prediction
+
+        # P x and x^T P in one row-major pass over P
+        denominator = forgetting_factor
+        xP[:] = 0.0
+        for r in range(num_taps):
+            row = 0.0
+            for c in range(num_taps):
+                row += P[r, c] * window[c]
+                xP[c] += window[r] * P[r, c]
+            Px[r] = row
+            denominator += window[r] * row
+        for r in range(num_taps):
+            gain = Px[r] / denominator
+            weights[r] += gain * error
+            for c in range(num_taps):
+                P[r, c] = (P[r, c] - gain * xP[c]) * inverse_factor
+        output[i] = prediction
@@ -0,0 +1,165 @@
+"""Throughput, memory and convergence benchmark for the adaptive filters of 19CCE311_Assignment_LMS_RLS.py.
+
+Every filter is run over a synthetic system-identification problem (coloured
+noise through a random FIR plus measurement noise) for each combination of
+the swept parameters. Results are written as JSON, and a previous results file
+can be passed with --baseline to flag throughput regressions.
+
+    python benchmark_adaptive_filters.py --taps 64 256 --lengths 8000 --output results.json
+"""
+import argparse
+import importlib
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+assignment = importlib.import_module('19CCE311_Assignment_LMS_RLS')
+
+# Filter name -> (class, adaptation parameter it takes)
+FILTERS = {
+    'lms': (assignment.LMSFilter, 'step_size'),
+    'nlms': (assignment.NLMSFilter, 'step_size'),
+    'block_lms': (assignment.BlockLMSFilter, 'step_size'),
+    'rls': (assignment.RLSFilter, 'forgetting_factor'),
+    'inplace_rls': (assignment.InPlaceRLSFilter, 'forgetting_factor'),
+    'fast_rls': (assignment.FastRLSFilter, 'forgetting_factor'),
+}
+
+NOISE_LEVEL = 0.01
+CONVERGENCE_WINDOW = 256
+CONVERGENCE_FACTOR = 2.0
+
+def make_problem(num_taps, length, seed=0):
+    """Returns a (noisy, clean) pair where clean is an unknown FIR of the coloured noisy input"""
+    rng = np.random.default_rng(seed)
+    noisy = np.convolve(rng.standard_normal(length), [1.0, 0.8, 0.3])[:length]
+    system = rng.standard_normal(num_taps) / np.sqrt(num_taps)
+    clean = np.zeros(length)
+    clean[num_taps:] = assignment.tap_delay_line(noisy, num_taps) @ system
+    clean += NOISE_LEVEL * rng.standard_normal(length)
+    return noisy.astype(np.float32), clean.astype(np.float32)
+
+def samples_to_convergence(squared_error):
+    """Returns the first sample after which the smoothed squared error stays within
+    CONVERGENCE_FACTOR of its steady-state value, or None if it never settles"""
+    if len(squared_error) < 2 * CONVERGENCE_WINDOW:
+        return None
+    steady_state = np.mean(squared_error[-max(CONVERGENCE_WINDOW, len(squared_error) // 10):])
+    if not np.isfinite(steady_state):
+        return None # Diverged
+    smoothed = np.convolve(squared_error, np.ones(CONVERGENCE_WINDOW) / CONVERGENCE_WINDOW, mode='valid')
+    above = np.nonzero(~(smoothed <= CONVERGENCE_FACTOR * steady_state))[0]
+    if len(above) == 0:
+        return 0
+    if above[-1] == len(smoothed) - 1:
+        return None
+    return int(above[-1] + CONVERGENCE_WINDOW)
+
+def benchmark_filter(name, num_taps, parameter, noisy, clean, use_jit=False, memory_samples=2000):
+    """Returns the throughput, peak memory and convergence record of one filter configuration"""
+    adaptive_class, _ = FILTERS[name]
+
+    np.random.seed(0)
+    adaptive_filter = adaptive_class(num_taps, parameter)
+    if use_jit:
+        assignment.run_adaptive_filter(adaptive_class(num_taps, parameter), noisy[:2 * num_taps],
+                                       clean[:2 * num_taps], use_jit) # Compile outside the timing
+    with np.errstate(all='ignore'): # Some grid points diverge; they are reported, not warned about
+        start = time.perf_counter()
+        output = assignment.run_adaptive_filter(adaptive_filter, noisy, clean, use_jit)
+        elapsed = time.perf_counter() - start
+
+    np.random.seed(0)
+    adaptive_filter = adaptive_class(num_taps, parameter)
+    tracemalloc.start()
+    with np.errstate(all='ignore'):
+        assignment.run_adaptive_filter(adaptive_filter, noisy[:num_taps + memory_samples],
+                                       clean[:num_taps + memory_samples], use_jit)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    with np.errstate(all='ignore'):
+        squared_error = (clean[num_taps:].astype(np.float64) - output[num_taps:])**2
+    steady_state_mse = float(np.mean(squared_error[-len(squared_error) // 10:]))
+    return {
+        'filter': name,
+        'num_taps': num_taps,
+        'parameter': parameter,
+        'length': len(noisy),
+        'jit': use_jit,
+        'samples_per_second': (len(noisy) - num_taps) / elapsed,
+        'peak_memory_bytes': peak_memory,
+        'samples_to_convergence': samples_to_convergence(squared_error),
+        'steady_state_mse': steady_state_mse if np.isfinite(steady_state_mse) else None,
+    }
+
+def run_benchmarks(filters, taps, step_sizes, forgetting_factors, lengths, use_jit=False):
+    """Sweeps every filter over the parameter grid and returns the list of records"""
+    results = []
+    for num_taps, length in itertools.product(taps, lengths):
+        noisy, clean = make_problem(num_taps, length)
+        for name in filters:
+            parameters = step_sizes if FILTERS[name][1] == 'step_size' else forgetting_factors
+            for parameter in parameters:
+                record = benchmark_filter(name, num_taps, parameter, noisy, clean, use_jit)
+                print('%-12s taps=%-5d param=%-7g length=%-7d %10.0f samples/s %8.1f KiB  converged after %s'
+                      % (name, num_taps, parameter, length, record['samples_per_second'],
+                         record['peak_memory_bytes'] / 1024, record['samples_to_convergence']))
+                results.append(record)
+    return results
+
+def find_regressions(results, baseline, tolerance):
+    """Returns the records whose throughput dropped by more than tolerance against a baseline"""
+    key = lambda record: (record['filter'], record['num_taps'], record['parameter'], record['length'], record['jit'])
+    previous = {key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get(key(record))
+        if old and record['samples_per_second'] < (1 - tolerance) * old['samples_per_second']:
+            regressions.append((record, old))
+    return regressions
+
+def parse_arguments():
+    """Parses the command line options"""
+    parser = argparse.ArgumentParser(description='Benchmark the LMS/RLS adaptive filters')
+    parser.add_argument('--filters', nargs='+', choices=sorted(FILTERS), default=sorted(FILTERS))
+    parser.add_argument('--taps', nargs='+', type=int, default=[assignment.NUM_TAPS])
+    parser.add_argument('--step-sizes', nargs='+', type=float, default=[assignment.STEP_SIZE])
+    parser.add_argument('--forgetting-factors', nargs='+', type=float, default=[assignment.FORGETTING_FACTOR])
+    parser.add_argument('--lengths', nargs='+', type=int, default=[8000])
+    parser.add_argument('--jit', action='store_true', help='use the compiled kernels where available')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='previous results file to compare throughput against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed relative throughput drop before a result counts as a regression')
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    results = run_benchmarks(args.filters, args.taps, args.step_sizes, args.forgetting_factors,
+                             args.lengths, args.jit)
+    with open(args.output, 'w') as file:
+        json.dump({'python': platform.python_version(), 'numpy': np.__version__,
+                   'machine': platform.machine(), 'results': results}, file, indent=2)
+    print('Results written to', args.output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for record, old in regressions:
+            print('Regression: %s taps=%d param=%g length=%d %.0f -> %.0f samples/s'
+                  % (record['filter'], record['num_taps'], record['parameter'], record['length'],
+                     old['samples_per_second'], record['samples_per_second']))
+        if regressions:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
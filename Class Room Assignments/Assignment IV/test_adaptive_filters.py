@@ -0,0 +1,136 @@
+"""Accuracy checks for the adaptive filters and spectral analysis of 19CCE311_Assignment_LMS_RLS.py.
+
+    python -m pytest test_adaptive_filters.py
+"""
+import importlib
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+from scipy import signal
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, DIRECTORY)
+assignment = importlib.import_module('19CCE311_Assignment_LMS_RLS')
+benchmark = importlib.import_module('benchmark_adaptive_filters')
+
+def read_speech():
+    """Returns the bundled (noisy, clean) speech as main() reads it"""
+    _, noisy = assignment.read_audio_file(os.path.join(DIRECTORY, assignment.NOISY_SIGNAL_FILE))
+    _, clean = assignment.read_audio_file(os.path.join(DIRECTORY, assignment.CLEAN_SIGNAL_FILE))
+    return assignment.pad_audio_signal(noisy, len(clean)), clean
+
+def steady_state_mse(adaptive_filter, noisy, clean):
+    """Returns the mean squared error of a filter over the second half of a signal"""
+    output = assignment.run_adaptive_filter(adaptive_filter, noisy, clean)
+    return np.mean((output[len(clean) // 2:] - clean[len(clean) // 2:])**2)
+
+@pytest.mark.parametrize('num_taps, forgetting_factor', [(64, 0.99), (64, 0.999), (256, 0.99), (512, 0.99)])
+def test_fast_rls_tracks_rls(num_taps, forgetting_factor):
+    """The O(N) fast RLS filter settles to the steady-state error of the O(N^2) RLS filter"""
+    noisy, clean = benchmark.make_problem(num_taps, 8000)
+    np.random.seed(0)
+    fast_mse = steady_state_mse(assignment.FastRLSFilter(num_taps, forgetting_factor), noisy, clean)
+    np.random.seed(0)
+    rls_mse = steady_state_mse(assignment.RLSFilter(num_taps, forgetting_factor), noisy, clean)
+    assert fast_mse < 1.2 * rls_mse
+
+def test_block_lms_tracks_lms():
+    """The frequency-domain block LMS filter settles near LMS on the speech at the assignment's defaults"""
+    noisy, clean = read_speech()
+    np.random.seed(0)
+    block_mse = steady_state_mse(assignment.BlockLMSFilter(assignment.NUM_TAPS, assignment.STEP_SIZE), noisy, clean)
+    np.random.seed(0)
+    lms_mse = steady_state_mse(assignment.LMSFilter(assignment.NUM_TAPS, assignment.STEP_SIZE), noisy, clean)
+    assert block_mse < 3 * lms_mse
+
+def test_multichannel_rls_matches_rls():
+    """Every channel of the multichannel RLS filter follows its own RLSFilter, long after P used to drift"""
+    num_taps = 32
+    problems = [benchmark.make_problem(num_taps, 6000, seed) for seed in range(2)]
+    noisy = np.stack([noisy for noisy, _ in problems]).astype(np.float64)
+    clean = np.stack([clean for _, clean in problems]).astype(np.float64)
+    multichannel = assignment.MultichannelRLSFilter(2, num_taps, 0.99)
+    initial_weights = multichannel.weights.copy()
+    output = assignment.apply_multichannel_filter(multichannel, noisy, clean)
+    for channel in range(2):
+        rls = assignment.RLSFilter(num_taps, 0.99)
+        rls.weights[:] = initial_weights[channel]
+        expected = assignment.run_adaptive_filter(rls, noisy[channel], clean[channel])
+        np.testing.assert_allclose(output[channel], expected, rtol=0, atol=1e-9)
+
+class Interrupted(Exception):
+    pass
+
+def interrupt_checkpointed_run(adaptive_filter, noisy, clean, checkpoint_file):
+    """Kills a checkpointed run between the checkpoints after 1500 and 2000 updates"""
+    update = adaptive_filter.update
+    calls = itertools.count(1)
+    def interrupted_update(signal, target):
+        if next(calls) > 1700:
+            raise Interrupted()
+        return update(signal, target)
+    adaptive_filter.update = interrupted_update
+    with pytest.raises(Interrupted):
+        assignment.run_with_checkpoints(adaptive_filter, noisy, clean, checkpoint_file, checkpoint_interval=500)
+
+def test_checkpoint_resume_matches_uninterrupted_run(tmp_path):
+    """A run killed between checkpoints and resumed gives the same output and weights as one that was not,
+    and leaves no checkpoint behind once it completes"""
+    num_taps = 32
+    noisy, clean = benchmark.make_problem(num_taps, 3000)
+    np.random.seed(0)
+    expected_filter = assignment.InPlaceRLSFilter(num_taps, 0.99)
+    expected, _ = assignment.run_with_checkpoints(expected_filter, noisy, clean)
+
+    checkpoint_file = str(tmp_path / 'rls.npz')
+    np.random.seed(0)
+    interrupt_checkpointed_run(assignment.InPlaceRLSFilter(num_taps, 0.99), noisy, clean, checkpoint_file)
+
+    np.random.seed(1)
+    resumed_filter = assignment.InPlaceRLSFilter(num_taps, 0.99)
+    output, _ = assignment.run_with_checkpoints(resumed_filter, noisy, clean, checkpoint_file, checkpoint_interval=500)
+    np.testing.assert_array_equal(output, expected)
+    np.testing.assert_array_equal(resumed_filter.weights, expected_filter.weights)
+    assert not os.path.exists(checkpoint_file)
+    assert not os.path.exists(assignment.checkpoint_output_file(checkpoint_file))
+
+def test_checkpoint_rejects_other_signal(tmp_path):
+    """A checkpoint is not resumed on a signal other than the one it was taken on"""
+    num_taps = 32
+    noisy, clean = benchmark.make_problem(num_taps, 3000)
+    checkpoint_file = str(tmp_path / 'rls.npz')
+    interrupt_checkpointed_run(assignment.InPlaceRLSFilter(num_taps, 0.99), noisy, clean, checkpoint_file)
+    other_noisy, other_clean = benchmark.make_problem(num_taps, 3000, seed=1)
+    with pytest.raises(ValueError):
+        assignment.run_with_checkpoints(assignment.InPlaceRLSFilter(num_taps, 0.99), other_noisy, other_clean,
+                                        checkpoint_file, checkpoint_interval=500)
+
+@pytest.mark.skipif(not assignment.adaptive_kernels.NUMBA_AVAILABLE, reason='Numba is not installed')
+def test_jit_kernels_match_filter_classes():
+    """Each compiled kernel reproduces its NumPy filter class to within JIT_TOLERANCE"""
+    noisy, clean = read_speech()
+    for name, difference in assignment.check_jit_parity(noisy, clean).items():
+        assert difference <= assignment.JIT_TOLERANCE, name
+
+def test_reduced_precision_accuracy():
+    """Every float32 and Q15 filter reaches its DTYPE_SNR_THRESHOLDS output SNR against float64 at NUM_TAPS"""
+    noisy, clean = read_speech()
+    np.random.seed(0)
+    snr = assignment.check_dtype_accuracy(noisy, clean)
+    assert set(snr) == set(assignment.DTYPE_SNR_THRESHOLDS)
+    for name, value in snr.items():
+        assert value >= assignment.DTYPE_SNR_THRESHOLDS[name], name
+
+def test_welch_psd_matches_scipy():
+    """The chunked Welch PSD equals scipy.signal.welch with its defaults, DC offset included"""
+    rate = 16000
+    noisy = np.random.default_rng(0).standard_normal(20000) + 0.5
+    chunks = [noisy[start:start + 3000] for start in range(0, len(noisy), 3000)]
+    freqs, psd = assignment.welch_psd(chunks, rate)
+    expected_freqs, expected = signal.welch(noisy, rate, nperseg=assignment.SEGMENT_LENGTH,
+                                            noverlap=assignment.SEGMENT_OVERLAP)
+    np.testing.assert_allclose(freqs, expected_freqs)
+    np.testing.assert_allclose(psd, expected, rtol=1e-10, atol=0)
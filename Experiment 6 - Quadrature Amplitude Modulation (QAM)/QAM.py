@@ -28,7 +28,6 @@ from gnuradio.filter import firdes
 import sip
 from gnuradio import analog
 from gnuradio import blocks
-import numpy
 from gnuradio import filter
 from gnuradio import gr
 from gnuradio.fft import window
@@ -37,11 +36,22 @@ import signal
 from argparse import ArgumentParser
 from gnuradio.eng_arg import eng_float, intx
 from gnuradio import eng_notation
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import random_streams
 
 
 
 from gnuradio import qtgui
 
+def snipfcn_snippet_0(self):
+    print("Random Seed: " + str(self.seed))
+
+
+def snippets_main_after_init(tb):
+    snipfcn_snippet_0(tb)
+
 class QAM(gr.top_block, Qt.QWidget):
 
     def __init__(self):
@@ -78,6 +88,7 @@ class QAM(gr.top_block, Qt.QWidget):
         ##################################################
         # Variables
         ##################################################
+        self.seed = seed = random_streams.root_seed()
         self.samp_rate = samp_rate = 500000
 
         ##################################################
@@ -170,8 +181,8 @@ class QAM(gr.top_block, Qt.QWidget):
         self.analog_sig_source_x_0_1_0_0 = analog.sig_source_f(samp_rate, analog.GR_SIN_WAVE, 140000, 2, 0, 0)
         self.analog_sig_source_x_0_1_0 = analog.sig_source_f(samp_rate, analog.GR_SIN_WAVE, 140000, 1, 0, 0)
         self.analog_sig_source_x_0_1 = analog.sig_source_f(samp_rate, analog.GR_COS_WAVE, 140000, 1, 0, 0)
-        self.analog_random_source_x_0_0 = blocks.vector_source_i(list(map(int, numpy.random.randint((-2), 2, 1000))), True)
-        self.analog_random_source_x_0 = blocks.vector_source_i(list(map(int, numpy.random.randint((-2), 2, 1000))), True)
+        self.analog_random_source_x_0_0 = blocks.vector_source_i(random_streams.generator(seed, 1).integers(-2, 2, 1000).tolist(), True, 1, [])
+        self.analog_random_source_x_0 = blocks.vector_source_i(random_streams.generator(seed, 0).integers(-2, 2, 1000).tolist(), True, 1, [])
 
 
         ##################################################
@@ -209,6 +220,14 @@ class QAM(gr.top_block, Qt.QWidget):
 
         event.accept()
 
+    def get_seed(self):
+        return self.seed
+
+    def set_seed(self, seed):
+        self.seed = seed
+        self.analog_random_source_x_0.set_data(random_streams.generator(self.seed, 0).integers(-2, 2, 1000).tolist(), [])
+        self.analog_random_source_x_0_0.set_data(random_streams.generator(self.seed, 1).integers(-2, 2, 1000).tolist(), [])
+
     def get_samp_rate(self):
         return self.samp_rate
 
@@ -235,6 +254,7 @@ def main(top_block_cls=QAM, options=None):
     qapp = Qt.QApplication(sys.argv)
 
     tb = top_block_cls()
+    snippets_main_after_init(tb)
 
     tb.start()
 
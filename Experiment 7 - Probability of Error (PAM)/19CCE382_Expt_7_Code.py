@@ -1,9 +1,18 @@
 import matplotlib.pyplot as plt # Provides an implicit way of plotting
 import numpy as np # Support for large, multi-dimensional arrays and matrices
 import math # Provides access to the mathematical functions defined by the C standard
+import os # Miscellaneous operating system interfaces
+import sys # System-specific parameters and functions
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from random_streams import root_seed, spawn_generators # Reproducible random-number streams
+
+seed = root_seed() # Set SIMULATION_SEED to repeat a run
+print("Random Seed: " + str(seed))
+streams = spawn_generators(11, seed) # Stream 0 draws the data, stream num the noise of SNR point num
 
 t = []
-xt = np.random.normal(0, 1, 10000)
+xt = streams[0].normal(0, 1, 10000)
 for i in range(len(xt)):
     if i>0.5:
         t.append(i)
@@ -27,7 +36,7 @@ for num in range(1,11):
     sigma = (10*10**(-num/10)/2)
     print("\n" + str(num) + " - Sigma Value: " + str(sigma))
     
-    noise = np.random.normal(0,sigma,10000)
+    noise = streams[num].normal(0,sigma,10000)
     count, bins, ignored = plt.hist(noise, 1000, density=True)
     plt.plot(bins, np.ones_like(bins), linewidth=2, color='r')
     plt.show()
@@ -2,9 +2,14 @@
 
 import matplotlib.pyplot as plt # Provides an implicit way of plotting
 import numpy as np # Support for large, multi-dimensional arrays and matrices
+import os # Miscellaneous operating system interfaces
+import sys # System-specific parameters and functions
 import warnings
 warnings.filterwarnings('ignore') # Never print matching warnings
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from random_streams import root_seed, generator # Reproducible random-number streams
+
 # Compute DFT coefficients using the linear transformation method:    
 def DFT(x, plot_name):
 
@@ -41,7 +46,9 @@ def DFT(x, plot_name):
 
 num_symbols = 10
 sps = 8 # 8 samples per symbol
-bits = np.random.randint(0, 2, num_symbols) # Our data to be transmitted, 1's and 0's
+seed = root_seed() # Set SIMULATION_SEED to repeat a run
+print("Random Seed: " + str(seed))
+bits = generator(seed).integers(0, 2, num_symbols) # Our data to be transmitted, 1's and 0's
 x = np.array([])
 
 for bit in bits:
@@ -0,0 +1,46 @@
+"""Reproducible random-number streams shared by the noise simulations of the experiments and assignments.
+
+Every simulation draws from np.random.Generator objects derived from one
+root seed instead of the global np.random state. A stream is identified by
+the root seed and a key, e.g. the index of an SNR point, and is built as
+SeedSequence(root, spawn_key=key), which is exactly the child that
+SeedSequence.spawn would hand out. Streams with different keys are
+statistically independent, and the same key always gives the same stream, so
+work split across processes reproduces bit for bit whatever the number of
+workers, as long as each piece of work draws from its own keyed stream.
+
+The root seed is the one passed in, else the SIMULATION_SEED environment
+variable, else fresh OS entropy. Scripts print it so any run can be repeated.
+"""
+import os
+
+import numpy as np
+
+SEED_VARIABLE = 'SIMULATION_SEED'
+
+def root_seed(seed=None):
+    """Returns seed, else $SIMULATION_SEED, else fresh OS entropy, as an integer to print and reuse"""
+    if seed is not None:
+        return int(seed)
+    if os.environ.get(SEED_VARIABLE):
+        return int(os.environ[SEED_VARIABLE])
+    return np.random.SeedSequence().entropy
+
+def seed_sequence(seed=None, *key):
+    """Returns the SeedSequence of the stream keyed by key under a root seed (or under another SeedSequence)"""
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(seed.entropy, spawn_key=tuple(seed.spawn_key) + key)
+    return np.random.SeedSequence(root_seed(seed), spawn_key=key)
+
+def generator(seed=None, *key):
+    """Returns a Generator for the stream keyed by key under a root seed"""
+    return np.random.default_rng(seed_sequence(seed, *key))
+
+def spawn_seeds(count, seed=None):
+    """Returns the SeedSequences of streams 0..count-1 under a seed, e.g. one per worker or SNR point"""
+    parent = seed_sequence(seed)
+    return [seed_sequence(parent, i) for i in range(count)]
+
+def spawn_generators(count, seed=None):
+    """Returns Generators for streams 0..count-1 under a seed"""
+    return [np.random.default_rng(child) for child in spawn_seeds(count, seed)]